@@ -1,16 +1,93 @@
-import json
+import fnmatch
+import hashlib
+import orjson
+import pathlib
+import pickle
 import pulumi
 import pulumi_aws as aws
 from pulumi import Config, Output
 
+_PARSE_CACHE_DIR = pathlib.Path.home() / ".cache" / "pulumi-iam"
+
+# Serialized inline policies keyed by canonical document bytes, so a document
+# attached to several groups is minimized and serialized only once
+_inline_policy_cache = {}
+
+def _serialize_inline_policy(policy_document):
+    """Return the (shared) serialized Output for a dict policy document."""
+    key = orjson.dumps(policy_document, option=orjson.OPT_SORT_KEYS)
+    cached = _inline_policy_cache.get(key)
+    if cached is None:
+        # Compact separators: whitespace counts against IAM's policy size limit
+        cached = Output.json_dumps(
+            _minimize_policy_document(policy_document), separators=(",", ":")
+        )
+        _inline_policy_cache[key] = cached
+    return cached
+
+def _load_imported_groups(raw_config):
+    """Parse the imported_groups JSON blob, memoized on disk by content hash.
+
+    The config blob can grow to multiple MB for large accounts and is
+    re-parsed on every preview/up. Caching the parsed structure keyed by a
+    hash of the raw string makes repeat runs skip the JSON pass entirely;
+    any config change produces a new hash, so the cache can never go stale.
+    """
+    digest = hashlib.blake2b(raw_config.encode(), digest_size=16).hexdigest()
+    cache_path = _PARSE_CACHE_DIR / f"imported_groups_{digest}.pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    groups = orjson.loads(raw_config)
+
+    try:
+        _PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump(groups, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # Cache is best-effort; never fail the program over it
+
+    return groups
+
+def _minimize_actions(actions):
+    """Drop exact duplicates and wildcard-subsumed entries from an Action list.
+
+    IAM policies have hard size limits, so there is no point emitting
+    "iam:GetUser" alongside an "iam:Get*" entry that already covers it.
+    """
+    unique = sorted(set(actions))
+    wildcards = [a for a in unique if "*" in a or "?" in a]
+    return [
+        a for a in unique
+        if not any(w != a and fnmatch.fnmatchcase(a, w) for w in wildcards)
+    ]
+
+def _minimize_policy_document(policy_document):
+    """Apply _minimize_actions to every statement of a policy document."""
+    statements = policy_document.get("Statement", [])
+    if isinstance(statements, dict):
+        statements = [statements]
+    for statement in statements:
+        actions = statement.get("Action")
+        if isinstance(actions, list):
+            statement["Action"] = _minimize_actions(actions)
+    return policy_document
+
 config = Config()
 
+# Per-policy log lines cross the gRPC boundary to the engine; only emit them
+# when explicitly asked for
+VERBOSE = config.get_bool("verbose") or False
+
 # Get imported groups from config (JSON string)
 imported_groups_config = config.get("imported_groups") or "{}"
 
 try:
-    imported_groups = json.loads(imported_groups_config)
-except json.JSONDecodeError as e:
+    imported_groups = _load_imported_groups(imported_groups_config)
+except orjson.JSONDecodeError as e:
     pulumi.log.error(f"Failed to parse imported_groups config: {e}")
     pulumi.log.error("Please run 'python import_groups.py' from the groups_stack directory first.")
     imported_groups = {}
@@ -22,11 +99,16 @@ if not imported_groups:
 else:
     pulumi.log.info(f"Found {len(imported_groups)} imported groups to manage.")
 
+# Aggregated per-group info, exported once after the loop instead of three
+# stack outputs per group
+per_group_outputs = {}
+
 # Create IAM groups and attach policies for each imported group
 for group_name, group_config in imported_groups.items():
     group_path = group_config.get("path", "/")
     
-    pulumi.log.info(f"Creating group: {group_name} with path: {group_path}")
+    # Buffer per-group messages and emit one engine log call per group
+    log_lines = [f"Creating group: {group_name} with path: {group_path}"]
     
     # Create the IAM group
     group = aws.iam.Group(
@@ -41,16 +123,15 @@ for group_name, group_config in imported_groups.items():
     # Attach AWS managed policies
     aws_managed_policies = group_config.get("managed_policy_arns", [])
     for idx, policy_arn in enumerate(aws_managed_policies):
-        policy_name = policy_arn.split("/")[-1]  # Extract policy name from ARN
-        
         aws.iam.GroupPolicyAttachment(
             f"group-{group_name}-aws-policy-{idx}",
             group=group.name,
-            policy_arn=policy_arn,
-            opts=pulumi.ResourceOptions(depends_on=[group])
+            policy_arn=policy_arn
         )
         
-        pulumi.log.info(f"  Attached AWS managed policy: {policy_name}")
+        if VERBOSE:
+            policy_name = policy_arn.rpartition("/")[2]  # Extract policy name from ARN
+            log_lines.append(f"  Attached AWS managed policy: {policy_name}")
     
     # Attach customer managed policies
     customer_managed_policies = group_config.get("customer_managed_policies", [])
@@ -67,11 +148,11 @@ for group_name, group_config in imported_groups.items():
             aws.iam.GroupPolicyAttachment(
                 f"group-{group_name}-customer-policy-{idx}",
                 group=group.name,
-                policy_arn=policy_arn,
-                opts=pulumi.ResourceOptions(depends_on=[group])
+                policy_arn=policy_arn
             )
             
-            pulumi.log.info(f"  Attached customer managed policy: {policy_name}")
+            if VERBOSE:
+                log_lines.append(f"  Attached customer managed policy: {policy_name}")
     
     # Create and attach inline policies
     inline_policies = group_config.get("inline_policies", {})
@@ -80,31 +161,34 @@ for group_name, group_config in imported_groups.items():
             f"group-{group_name}-inline-{policy_name}",
             group=group.name,
             name=policy_name,
-            policy=json.dumps(policy_document) if isinstance(policy_document, dict) else policy_document,
-            opts=pulumi.ResourceOptions(depends_on=[group])
+            # Let the SDK serialize dict documents lazily; raw strings pass through untouched
+            policy=_serialize_inline_policy(policy_document) if isinstance(policy_document, dict) else policy_document
         )
         
-        pulumi.log.info(f"  Created inline policy: {policy_name}")
+        if VERBOSE:
+            log_lines.append(f"  Created inline policy: {policy_name}")
     
-    # Export group information for reference
-    pulumi.export(f"group_{group_name}_arn", group.arn)
-    pulumi.export(f"group_{group_name}_path", group.path)
+    pulumi.log.info("\n".join(log_lines))
     
-    # Export policy counts for monitoring
+    # Collect group information for the aggregated export
     total_policies = len(aws_managed_policies) + len(customer_managed_policies) + len(inline_policies)
-    pulumi.export(f"group_{group_name}_policy_count", total_policies)
+    per_group_outputs[group_name] = Output.all(
+        arn=group.arn,
+        path=group.path,
+        policy_count=total_policies
+    )
 
-# Export summary information
+# Export summary information; one aggregated map keeps the engine RPC count
+# flat no matter how many groups are managed
+pulumi.export("groups", Output.all(**per_group_outputs) if per_group_outputs else {})
 pulumi.export("total_groups_managed", len(imported_groups))
 pulumi.export("groups_list", list(imported_groups.keys()) if imported_groups else [])
 
 # Provide helpful information in outputs
 if imported_groups:
+    # The per-group name listing is redundant with the groups_list export
     pulumi.log.info("All imported groups have been processed successfully.")
     pulumi.log.info(f"Total groups managed: {len(imported_groups)}")
-    pulumi.log.info("Groups available for user assignment:")
-    for group_name in imported_groups.keys():
-        pulumi.log.info(f"  • {group_name}")
 else:
     pulumi.log.warn("No groups were processed.")
     pulumi.log.warn("To import groups:")
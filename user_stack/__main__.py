@@ -11,22 +11,21 @@ users_dict = json.loads(users_config)  # Expected format: { username: { groups:
 # Track any existing users with login profiles to prevent creation errors
 login_profile_check = {}
 
-# Let's first check which users already exist before creating resources
+# One bulk listing tells us which configured users already exist in AWS;
+# the old per-user get_user probe cost a synchronous round-trip per user
+# on every preview for the same boolean answer
 try:
-    # This is a safer approach that doesn't rely on dynamic resources
-    for username in users_dict.keys():
-        # Just declare the try/except here - we'll handle failures gracefully at runtime
-        try:
-            # Get user data
-            existing_user = aws.iam.get_user(user_name=username)
-            # Check if login profile exists by attempting to get login profile
-            # We can't directly check this in Pulumi, so we'll use a workaround
-            login_profile_check[username] = True
-        except Exception:
-            # If user doesn't exist, we'll create it normally
-            login_profile_check[username] = False
+    import boto3
+
+    paginator = boto3.client("iam").get_paginator("list_users")
+    existing_users = frozenset(
+        aws_user["UserName"]
+        for page in paginator.paginate(PaginationConfig={"PageSize": 1000})
+        for aws_user in page["Users"]
+    )
+    login_profile_check = {username: username in existing_users for username in users_dict}
 except Exception:
-    # If anything fails, continue with normal resource creation
+    # If the listing fails, continue with normal resource creation
     pass
 
 for username, user_obj in users_dict.items():
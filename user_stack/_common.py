@@ -0,0 +1,113 @@
+"""Helpers shared by the user_stack scripts."""
+
+import csv
+import io
+import json
+import subprocess
+import time
+
+def get_pulumi_config_value(key, cwd=None):
+    """Read a stack config value via the CLI; None when unset.
+
+    Asks for --json output so the value arrives machine-readable instead
+    of pretty-printed (which can wrap and forced callers into bare-except
+    fallbacks), and falls back to the plain form for older CLIs.
+    """
+    result = subprocess.run(
+        ["pulumi", "config", "get", key, "--json"],
+        capture_output=True, text=True, cwd=cwd
+    )
+    if result.returncode == 0:
+        try:
+            return json.loads(result.stdout)["value"]
+        except (ValueError, KeyError):
+            pass
+    result = subprocess.run(
+        ["pulumi", "config", "get", key],
+        capture_output=True, text=True, cwd=cwd
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def set_pulumi_config(key, value):
+    """Set a stack config value, streaming the payload over stdin.
+
+    The users JSON can reach hundreds of KB; passing it through argv
+    copies it into the exec call and eventually trips ARG_MAX. The Pulumi
+    CLI reads the value from stdin when it is omitted from the command
+    line, so pipe it instead.
+    """
+    return subprocess.run(["pulumi", "config", "set", key], input=value, text=True)
+
+def load_credential_report(iam_client):
+    """Fetch the account credential report as a dict keyed by user name.
+
+    One report carries password_enabled and access-key state for every user
+    in the account, replacing a get_login_profile (which raises for the
+    common no-console case) plus list_access_keys pair per user.
+    """
+    while iam_client.generate_credential_report()['State'] != 'COMPLETE':
+        time.sleep(1)
+    content = iam_client.get_credential_report()['Content'].decode()
+    return {row['user']: row for row in csv.DictReader(io.StringIO(content))}
+
+def build_user_groups_map(iam_client, group_names):
+    """Build the full user->groups mapping from the group side.
+
+    One get_group call per group returns every member user, so the whole
+    map costs O(groups) API calls — cheaper than one list_groups_for_user
+    per user whenever the account has fewer groups than users.
+    """
+    user_groups = {}
+    paginator = iam_client.get_paginator('get_group')
+    for group_name in group_names:
+        for page in paginator.paginate(GroupName=group_name):
+            for user in page['Users']:
+                user_groups.setdefault(user['UserName'], []).append(group_name)
+    return user_groups
+
+def fetch_user_entry(iam_client, username, path, groups=None, report=None):
+    """Build the users-config entry for a single IAM user.
+
+    Shared by import_user.py and sync_users.py so the group membership,
+    console-access and access-key probing lives in one place. Pass `groups`
+    when the caller already resolved memberships (see
+    build_user_groups_map) and `report` when a credential report is loaded
+    (see load_credential_report) to skip the per-user lookups.
+    """
+    if groups is None:
+        # Get user's group memberships (paginated; the bare call truncates
+        # past 100 groups)
+        groups = [
+            group['GroupName']
+            for page in iam_client.get_paginator('list_groups_for_user').paginate(UserName=username)
+            for group in page['Groups']
+        ]
+
+    row = None if report is None else report.get(username)
+    if row is not None:
+        has_console_access = "yes" if row['password_enabled'] == 'true' else "no"
+        has_access_key = (
+            "yes"
+            if row['access_key_1_active'] == 'true' or row['access_key_2_active'] == 'true'
+            else "no"
+        )
+    else:
+        # Check if the user has console access (login profile)
+        has_console_access = "no"
+        try:
+            iam_client.get_login_profile(UserName=username)
+            has_console_access = "yes"
+        except iam_client.exceptions.NoSuchEntityException:
+            pass
+
+        # Check if the user has access keys; one key is enough to answer
+        # the yes/no question, so don't ask for the full list
+        access_keys = iam_client.list_access_keys(UserName=username, MaxItems=1)
+        has_access_key = "yes" if access_keys['AccessKeyMetadata'] else "no"
+
+    return {
+        "groups": groups,
+        "create_key": has_access_key,
+        "has_console_access": has_console_access,
+        "path": path
+    }
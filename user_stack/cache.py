@@ -0,0 +1,37 @@
+"""Small on-disk TTL cache for slow AWS/Pulumi lookups."""
+
+import orjson
+import os
+import tempfile
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/pulumi-aws-iam")
+
+def cached(key, ttl, fn):
+    """Return fn(), memoized on disk under `key` for `ttl` seconds.
+
+    Entries are written atomically via os.replace so concurrent runs never
+    observe a torn file; any read or decode problem just falls through to
+    calling fn() again.
+    """
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "rb") as f:
+            entry = orjson.loads(f.read())
+        if entry["ts"] > time.time() - ttl:
+            return entry["value"]
+    except (OSError, orjson.JSONDecodeError, KeyError):
+        pass
+
+    value = fn()
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"ts": time.time(), "value": value}))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Cache is best-effort; never fail the caller over it
+
+    return value
@@ -1,42 +1,53 @@
 import json
 import subprocess
-import boto3
 import os
+from concurrent.futures import ThreadPoolExecutor
+from _aws import get_iam_client
+from _common import get_pulumi_config_value, set_pulumi_config
+from cache import cached
+
+def _fetch_pulumi_groups():
+    """Get imported groups from groups_stack config."""
+    raw_groups = get_pulumi_config_value("imported_groups", cwd="../groups_stack")
+
+    if raw_groups:
+        return list(json.loads(raw_groups).keys())
+
+    print("  Warning: No imported groups found in groups_stack configuration.")
+    print("   Run 'python import_groups.py' in the groups_stack directory first.")
+    return []
+
+def _fetch_aws_groups():
+    """Get current groups from AWS for validation.
+
+    The inventory rarely changes between consecutive runs, so it is
+    memoized on disk for five minutes; max-size pages cut the round
+    trips for the cold fetch.
+    """
+    try:
+        aws_profile = os.environ.get('AWS_PROFILE', 'default')
+        return cached(f"aws_groups_{aws_profile}", 300, lambda: [
+            group['GroupName']
+            for page in get_iam_client(aws_profile).get_paginator('list_groups').paginate(
+                PaginationConfig={"PageSize": 1000}
+            )
+            for group in page['Groups']
+        ])
+    except Exception as e:
+        print(f"  Warning: Could not fetch AWS groups for validation: {e}")
+        return []
 
 def get_available_groups():
     """Get available groups from both Pulumi config and AWS for validation."""
     try:
-        # Get imported groups from groups_stack config
-        result = subprocess.run(
-            ["pulumi", "config", "get", "imported_groups", "--cwd", "../groups_stack"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
-            imported_groups = json.loads(result.stdout.strip())
-            pulumi_groups = list(imported_groups.keys())
-        else:
-            print("  Warning: No imported groups found in groups_stack configuration.")
-            print("   Run 'python import_groups.py' in the groups_stack directory first.")
-            pulumi_groups = []
-        
-        # Also get current groups from AWS for validation
-        try:
-            aws_profile = os.environ.get('AWS_PROFILE', 'default')
-            session = boto3.Session(profile_name=aws_profile)
-            iam_client = session.client('iam')
-            
-            aws_groups = []
-            paginator = iam_client.get_paginator('list_groups')
-            for page in paginator.paginate():
-                for group in page['Groups']:
-                    aws_groups.append(group['GroupName'])
-        except Exception as e:
-            print(f"  Warning: Could not fetch AWS groups for validation: {e}")
-            aws_groups = []
-        
-        return pulumi_groups, aws_groups
-        
+        # The Pulumi-CLI fetch and the AWS listing are independent I/O, so
+        # overlap them; total wall time becomes the slower of the two
+        # instead of their sum
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pulumi_future = executor.submit(_fetch_pulumi_groups)
+            aws_future = executor.submit(_fetch_aws_groups)
+            return pulumi_future.result(), aws_future.result()
+
     except Exception as e:
         print(f"Error getting available groups: {e}")
         return [], []
@@ -61,8 +72,10 @@ def display_available_groups(pulumi_groups, aws_groups):
         for idx, group in enumerate(pulumi_groups, 1):
             print(f"   {idx:2d}. {group}")
     
-    if aws_groups and set(aws_groups) != set(pulumi_groups):
-        missing_in_pulumi = set(aws_groups) - set(pulumi_groups)
+    aws_set = set(aws_groups)
+    pulumi_set = set(pulumi_groups)
+    if aws_groups and aws_set != pulumi_set:
+        missing_in_pulumi = aws_set - pulumi_set
         if missing_in_pulumi:
             print(f"\n  Groups in AWS but not in Pulumi config ({len(missing_in_pulumi)}):")
             for group in sorted(missing_in_pulumi):
@@ -72,25 +85,12 @@ def display_available_groups(pulumi_groups, aws_groups):
     print("=" * 60)
     return True
 
-def validate_selected_groups(selected_groups, available_groups):
-    """Validate that selected groups exist."""
-    invalid_groups = []
-    for group in selected_groups:
-        if group not in available_groups:
-            invalid_groups.append(group)
-    
-    if invalid_groups:
-        print(f"\n Error: The following groups don't exist: {', '.join(invalid_groups)}")
-        print("Please check the available groups list above.")
-        return False
-    
-    return True
-
 def check_access_key_limit(username):
     """Check if a user already has 2 access keys and warn if so."""
     try:
-        session = boto3.Session(profile_name=os.environ.get('AWS_PROFILE', 'default'))
-        iam_client = session.client('iam')
+        # The memoized shared client avoids a fresh session (config parse,
+        # model load, TLS handshake) on every call in the check loop
+        iam_client = get_iam_client(os.environ.get('AWS_PROFILE', 'default'))
         response = iam_client.list_access_keys(UserName=username)
         key_count = len(response.get('AccessKeyMetadata', []))
         
@@ -149,11 +149,13 @@ def main():
     
     # Use Pulumi groups as the primary source, fall back to AWS groups if needed
     available_groups = pulumi_groups if pulumi_groups else aws_groups
+    # Set mirror for membership tests; the list keeps its order for
+    # number-based selection
+    available_set = set(available_groups)
     
     # Retrieve the current 'users' config as a JSON object (dictionary).
-    result = subprocess.run(["pulumi", "config", "get", "users"], capture_output=True, text=True)
     try:
-        current_users = json.loads(result.stdout.strip() or "{}")
+        current_users = json.loads(get_pulumi_config_value("users") or "{}")
     except Exception:
         current_users = {}
 
@@ -188,32 +190,33 @@ def main():
         print("No groups specified. User will be created without group memberships.")
         groups_list = []
     else:
-        # Parse input - handle both numbers and names
+        # Parse input - handle both numbers and names. Validation and
+        # deduplication happen inline: every appended name came from
+        # available_groups, and the seen set drops repeats as they occur,
+        # so no follow-up passes over the list are needed
         groups_list = []
+        seen = set()
         for item in groups_input.split(","):
             item = item.strip()
-            
+
             # Check if it's a number (group index)
             try:
                 group_idx = int(item) - 1
                 if 0 <= group_idx < len(available_groups):
-                    groups_list.append(available_groups[group_idx])
+                    group = available_groups[group_idx]
+                    if group not in seen:
+                        seen.add(group)
+                        groups_list.append(group)
                 else:
                     print(f"  Warning: Group number {item} is out of range. Skipping.")
             except ValueError:
                 # It's a group name
-                if item in available_groups:
-                    groups_list.append(item)
+                if item in available_set:
+                    if item not in seen:
+                        seen.add(item)
+                        groups_list.append(item)
                 else:
                     print(f"  Warning: Group '{item}' not found. Skipping.")
-        
-        # Remove duplicates while preserving order
-        groups_list = list(dict.fromkeys(groups_list))
-        
-        # Validate final group list
-        if not validate_selected_groups(groups_list, available_groups):
-            print(" Group validation failed. Please try again.")
-            return
     
     print(f"\n Selected groups: {groups_list if groups_list else 'None'}")
     
@@ -247,9 +250,10 @@ def main():
         "path": user_path
     }
 
-    # Save configuration
-    updated_users = json.dumps(current_users)
-    subprocess.run(["pulumi", "config", "set", "users", updated_users])
+    # Save configuration; the helper streams the JSON over stdin so a
+    # large users blob never rides through argv
+    updated_users = json.dumps(current_users, separators=(',', ':'), ensure_ascii=False)
+    set_pulumi_config("users", updated_users)
     
     # Display summary
     print("\n" + "=" * 60)
@@ -277,41 +281,39 @@ def main():
         
         if result.returncode == 0:
             print("\n User created successfully!")
-            
-            # Try to show the password if console access was enabled
-            if has_console_access.lower() == "yes":
-                print("\n Retrieving generated password...")
-                password_result = subprocess.run(
-                    ["pulumi", "stack", "output", f"{new_username}_generatedPassword", "--show-secrets"],
+
+            # One --json call returns every output at once; the previous
+            # three per-credential spawns each paid full CLI startup
+            outputs = {}
+            if has_console_access.lower() == "yes" or create_key == "yes":
+                outputs_result = subprocess.run(
+                    ["pulumi", "stack", "output", "--json", "--show-secrets"],
                     capture_output=True,
                     text=True
                 )
-                
-                if password_result.returncode == 0 and password_result.stdout.strip():
-                    print(f"Console Password: {password_result.stdout.strip()}")
+                try:
+                    outputs = json.loads(outputs_result.stdout)
+                except ValueError:
+                    outputs = {}
+
+            # Try to show the password if console access was enabled
+            if has_console_access.lower() == "yes":
+                password = outputs.get(f"{new_username}_generatedPassword")
+                if password:
+                    print(f"Console Password: {password}")
                 else:
                     print("Password not available in outputs. Try running:")
                     print(f"  pulumi refresh --yes")
                     print(f"  pulumi stack output {new_username}_generatedPassword --show-secrets")
-            
+
             # Show access key if created
             if create_key == "yes":
-                print("\n Retrieving access key...")
-                key_result = subprocess.run(
-                    ["pulumi", "stack", "output", f"{new_username}_accessKeyId"],
-                    capture_output=True,
-                    text=True
-                )
-                secret_result = subprocess.run(
-                    ["pulumi", "stack", "output", f"{new_username}_secretAccessKey", "--show-secrets"],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if key_result.returncode == 0 and key_result.stdout.strip():
-                    print(f"Access Key ID: {key_result.stdout.strip()}")
-                    if secret_result.returncode == 0 and secret_result.stdout.strip():
-                        print(f"Secret Access Key: {secret_result.stdout.strip()}")
+                access_key_id = outputs.get(f"{new_username}_accessKeyId")
+                if access_key_id:
+                    print(f"Access Key ID: {access_key_id}")
+                    secret_key = outputs.get(f"{new_username}_secretAccessKey")
+                    if secret_key:
+                        print(f"Secret Access Key: {secret_key}")
         else:
             print("\n Deployment failed. Check the error messages above.")
     else:
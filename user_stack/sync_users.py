@@ -1,74 +1,117 @@
-import json
+import orjson
+import os
 import subprocess
-import boto3
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from _aws import get_iam_client
+from _common import fetch_user_entry, get_pulumi_config_value, set_pulumi_config
+
+# Bounded fan-out for per-user profiling calls; the work is latency-bound
+MAX_FETCH_WORKERS = 16
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+def load_users_config():
+    """Read the 'users' config without spawning the Pulumi CLI when possible.
+
+    'pulumi config get' costs a full CLI startup just to fetch a JSON blob
+    that already sits in Pulumi.<stack>.yaml on disk. When the stack name is
+    known (PULUMI_STACK), parse the file directly; otherwise fall back to
+    the CLI.
+    """
+    stack = os.environ.get("PULUMI_STACK")
+    if stack:
+        try:
+            with open(f"Pulumi.{stack}.yaml") as f:
+                config = yaml.load(f, Loader=SafeLoader).get("config", {})
+            # The key is namespaced by project name, e.g. "<project>:users"
+            for key, value in config.items():
+                if key.endswith(":users"):
+                    return orjson.loads(value or "{}")
+            return {}
+        except (OSError, yaml.YAMLError):
+            pass
+
+    try:
+        return orjson.loads(get_pulumi_config_value("users") or "{}")
+    except Exception:
+        return {}
 
 def main():
     # Initialize AWS clients
-    iam_client = boto3.client('iam')
-    
+    iam_client = get_iam_client()
+
     # Retrieve the current 'users' config as a JSON object
-    result = subprocess.run(["pulumi", "config", "get", "users"], capture_output=True, text=True)
-    try:
-        current_users = json.loads(result.stdout.strip() or "{}")
-    except Exception:
-        current_users = {}
+    current_users = load_users_config()
     
     print("Syncing all AWS IAM users to Pulumi configuration...")
-    
+
     # Use pagination to get all users regardless of path
     paginator = iam_client.get_paginator('list_users')
     page_iterator = paginator.paginate()  # No PathPrefix means all paths
-    
-    new_users_added = 0
-    
+
+    # Collect the users that are new to the config first; each one costs
+    # 2-3 IAM round-trips to profile, so the fetches fan out across a
+    # thread pool sharing the pooled adaptive-retry client (thread-safe
+    # for these read-only calls)
+    new_users = []
     for page in page_iterator:
-        aws_users = page['Users']
-        
-        # Process each AWS user
-        for aws_user in aws_users:
+        for aws_user in page['Users']:
             username = aws_user['UserName']
-            user_path = aws_user['Path']
-            
-            # Skip if user already exists in Pulumi config
             if username in current_users:
                 print(f"User '{username}' already exists in Pulumi config - skipping")
-                continue
-            
-            # Get user's group memberships
-            groups_response = iam_client.list_groups_for_user(UserName=username)
-            groups = [group['GroupName'] for group in groups_response['Groups']]
-            
-            # Check if the user has console access (login profile)
-            has_console_access = "no"
-            try:
-                iam_client.get_login_profile(UserName=username)
-                has_console_access = "yes"
-            except iam_client.exceptions.NoSuchEntityException:
-                pass
-            
-            # Check if the user has access keys
-            access_keys = iam_client.list_access_keys(UserName=username)
-            has_access_key = "yes" if access_keys['AccessKeyMetadata'] else "no"
-            
-            # Add user to Pulumi config with their original path
-            current_users[username] = {
-                "groups": groups,
-                "create_key": has_access_key,  # Preserve existing setting
-                "has_console_access": has_console_access,  # Preserve existing setting
-                "path": user_path  # Save the original path
-            }
-            new_users_added += 1
-            print(f"Added user '{username}' with path '{user_path}' and groups: {groups}")
+            else:
+                new_users.append((username, aws_user['Path']))
+
+    def fetch_group_memberships():
+        """Bulk user->groups map from one paginated authorization-details call.
+
+        get-account-authorization-details returns every user with its
+        GroupList embedded, so group membership for all new users costs a
+        few paginated requests instead of one list_groups_for_user each.
+        """
+        memberships = {}
+        paginator = iam_client.get_paginator('get_account_authorization_details')
+        for page in paginator.paginate(Filter=['User'], PaginationConfig={"PageSize": 1000}):
+            for detail in page['UserDetailList']:
+                memberships[detail['UserName']] = detail.get('GroupList', [])
+        return memberships
+
+    user_groups = None
+    if new_users:
+        try:
+            user_groups = fetch_group_memberships()
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('AccessDenied', 'AccessDeniedException'):
+                raise
+            # Restricted roles often lack iam:GetAccountAuthorizationDetails;
+            # fetch_user_entry falls back to per-user lookups
+            print("get-account-authorization-details not permitted; using per-user group lookups")
+
+    def fetch_user(user):
+        username, user_path = user
+        groups = None if user_groups is None else user_groups.get(username, [])
+        return username, user_path, fetch_user_entry(iam_client, username, user_path, groups=groups)
+
+    new_users_added = len(new_users)
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        for username, user_path, entry in executor.map(fetch_user, new_users):
+            current_users[username] = entry
+            print(f"Added user '{username}' with path '{user_path}' and groups: {entry['groups']}")
     
-    # Update Pulumi config with all users
+    # Update Pulumi config with all users; skip the engine entirely when the
+    # config is unchanged — the refresh is by far the dominant cost here
     if new_users_added > 0:
-        updated_users = json.dumps(current_users)
-        subprocess.run(["pulumi", "config", "set", "users", updated_users])
+        updated_users = orjson.dumps(current_users).decode()
+        set_pulumi_config("users", updated_users)
         print(f"Added {new_users_added} AWS users to Pulumi config")
+        subprocess.run(["pulumi", "refresh"])
     else:
-        print("No new users added to Pulumi config")
-    
-    subprocess.run(["pulumi","refresh"])
+        print("No new users added to Pulumi config - skipping refresh")
     print("Sync complete!")
 
 